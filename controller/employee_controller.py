@@ -1,4 +1,4 @@
-from services.employee_service import EmployeeService
+from services.employee_service import EmployeeService, ImportResult
 from domain.employee import Employee
 
 
@@ -35,9 +35,27 @@ class EmployeeController:
     def list_all(self) -> list[Employee]:
         return self.service.list_employees()
 
+    def search(self, text: str, limit: int = 50) -> list[Employee]:
+        return self.service.search_employees(text, limit=limit)
+
+    def reload(self) -> None:
+        """
+        重新從資料庫載入員工（捨棄快取）
+        """
+        self.service.reload_employees()
+
     def get(self, emp_id: str) -> Employee:
         return self.service.get_employee(emp_id)
 
+    # -------------------------
+    # Import / Export
+    # -------------------------
+    def import_file(self, path: str) -> ImportResult:
+        return self.service.import_file(path)
+
+    def export_file(self, path: str) -> int:
+        return self.service.export_file(path)
+
     # -------------------------
     # Update（基本資料）
     # -------------------------
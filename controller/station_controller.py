@@ -1,8 +1,56 @@
+from repository.recent_station_repository import RecentStationRepository
+from repository.ticket_route_repo import TicketRouteRepository
+from services import station_dataset
+from services.station_frecency import StationFrecency
+from services.station_index import StationIndex
+
+
 class StationController:
-    def __init__(self, repo):
+    def __init__(self, repo, recent_repo=None):
         self.repo = repo
+        # 啟動時載入一次（優先使用快照，不開 SQLite）；之後搜尋只查記憶體
+        self.index = StationIndex(station_dataset.load_snapshot() or repo.list_all())
+        self.frecency = StationFrecency(recent_repo or RecentStationRepository())
 
-    def search(self, keyword: str):
+    def search(self, keyword: str, limit: int = 10):
         if not keyword or len(keyword) < 1:
             return []
-        return self.repo.search(keyword)
+        return self.index.search(keyword, limit, boosts=self.frecency.scores())
+
+    def get_recent(self, limit: int = 5):
+        return self.frecency.top(limit)
+
+    def record_recent(self, station: dict):
+        self.frecency.record(station["code"], station["name"])
+
+    def suggest_destinations(self, origin_code: str, limit: int = 5):
+        """
+        由起站預測迄站：常用路線中最常搭乘的迄站 [{"code", "name"}]
+        """
+        if not origin_code:
+            return []
+        try:
+            rows = TicketRouteRepository.top_destinations(origin_code, limit)
+        except Exception as e:
+            print(f"[StationController] 無法讀取常用路線: {e}")
+            return []
+
+        stations = []
+        for end_station, _requests, _last_used in rows:
+            st = self.index.get(end_station)
+            if st:
+                stations.append(st)
+        return stations
+
+    def reload(self):
+        """
+        stations.db 更新後重建索引
+        """
+        self.repo.reopen()
+        self.index = StationIndex(self.repo.list_all())
+
+    def close(self):
+        """
+        程式結束前寫回最近使用紀錄
+        """
+        self.frecency.close()
@@ -4,6 +4,8 @@ from datetime import datetime
 
 from PySide6.QtCore import QTimer
 from repository.ticket_request_repo import TicketRequestRepository
+from repository.timetable_repo import TimetableRepository
+from core.exceptions import DuplicateRequestError
 
 
 class TicketController:
@@ -26,7 +28,11 @@ class TicketController:
         ticket_count: int,
         one_way: bool,
         schedule_at: datetime | None = None,
+        allow_duplicate: bool = False,
     ):
+        """
+        allow_duplicate：明知已有相同請求（處理中 / 已成功）仍要再送一次
+        """
         # =========================
         # 驗證
         # =========================
@@ -55,14 +61,47 @@ class TicketController:
         if not train_nos:
             raise ValueError("至少需提供一個車次")
 
+        if schedule_at and schedule_at <= datetime.now():
+            raise ValueError("排程時間必須晚於現在")
+
         # =========================
-        # 記錄 UI 訂票請求（存快照）
+        # 車次：依離線時刻表檢查（不存在 / 不停靠起訖站），在開啟瀏覽器前擋下
         # =========================
         try:
-            TicketRequestRepository.insert(
+            problems = TimetableRepository.validate_trains(
+                date, from_station, to_station, train_nos
+            )
+        except Exception as e:
+            # 時刻表無法讀取時不阻擋訂票，交由訂票網站判斷
+            print(f"[TicketController] 無法檢查時刻表: {e}")
+            problems = []
+        if problems:
+            raise ValueError("\n".join(problems))
+
+        # =========================
+        # 重複請求：在開啟瀏覽器前就擋下
+        # =========================
+        if not allow_duplicate:
+            existing = TicketRequestRepository.find_active_duplicate(
+                employee_id=employee.emp_id,
+                travel_date=date,
+                train_nos=train_nos,
+            )
+            if existing:
+                status = "處理中" if existing["status"] == "PENDING" else "已成功"
+                raise DuplicateRequestError(
+                    f"{employee.emp_id} 已於 {existing['requested_at'][:19]} "
+                    f"申請 {date} 車次 {existing['train_no']}（{status}）",
+                    existing,
+                )
+
+        # =========================
+        # 記錄 UI 訂票請求（員工資料由 employees 表 JOIN，不另存快照）
+        # =========================
+        request_id = None
+        try:
+            request_id = TicketRequestRepository.insert(
                 employee_id=employee.emp_id,
-                employee_name=employee.name,
-                employee_id_number=employee.id_number,
                 start_station=from_station,
                 end_station=to_station,
                 trip_type="ONE_WAY" if one_way else "ROUND_TRIP",
@@ -78,16 +117,23 @@ class TicketController:
         # =========================
         # Phase 1：準備訂票
         # =========================
-        self.service.prepare_booking(
-            employee_id=employee.emp_id,
-            id_number=employee.id_number,
-            from_station=from_station,
-            to_station=to_station,
-            date=date,
-            train_nos=train_nos,
-            ticket_count=ticket_count,
-            one_way=one_way,
-        )
+        try:
+            self.service.prepare_booking(
+                employee_id=employee.emp_id,
+                id_number=employee.id_number,
+                from_station=from_station,
+                to_station=to_station,
+                date=date,
+                train_nos=train_nos,
+                ticket_count=ticket_count,
+                one_way=one_way,
+                request_id=request_id,
+            )
+        except Exception:
+            # 沒送出就失敗：不要讓這筆請求一直擋住重送
+            if request_id:
+                TicketRequestRepository.mark_status(request_id, "FAILED")
+            raise
 
         # =========================
         # Phase 2：排程 / 立即送出
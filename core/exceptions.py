@@ -13,3 +13,11 @@ class ValidationError(AppError):
 class NotFoundError(AppError):
     """找不到資源（例如 Employee 不存在）"""
     pass
+
+
+class DuplicateRequestError(ValidationError):
+    """相同員工 / 乘車日期 / 車次已有處理中或成功的訂票請求"""
+
+    def __init__(self, message: str, existing):
+        super().__init__(message)
+        self.existing = existing
@@ -0,0 +1,43 @@
+# core/text.py
+"""
+搜尋用文字正規化
+- 全形 / 半形：NFKC（１０００ → 1000、ＡＢ → AB）
+- 異體字：統一成常用寫法（臺 → 台 …）
+- 英文不分大小寫
+寫入 search_key 與查詢字串都必須經過同一個函式
+"""
+import re
+import unicodedata
+
+# 異體字 → 常用字（站名中實際會遇到的組合）
+_VARIANTS = str.maketrans({
+    "臺": "台",
+    "峯": "峰",
+    "裏": "裡",
+    "温": "溫",
+    "鷄": "雞",
+    "淸": "清",
+    "眞": "真",
+    "爲": "為",
+    "衆": "眾",
+})
+
+
+def fold_text(text: str) -> str:
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    return text.translate(_VARIANTS).casefold().strip()
+
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold_roman(text: str) -> str:
+    """
+    英文 / 拼音比對用：只留英數字（Su'ao → suao、Taichung Port → taichungport）
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _NON_ALNUM.sub("", text)
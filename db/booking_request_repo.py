@@ -1,6 +1,6 @@
 import json
 from datetime import datetime
-from db.database import get_connection
+from db.database import transaction
 
 
 class BookingRequestRepository:
@@ -20,42 +20,41 @@ class BookingRequestRepository:
         scheduled_at,
         requested_at: datetime,
     ):
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            INSERT INTO booking_requests (
-                employee_id,
-                id_number,
-                from_station,
-                to_station,
-                trip_type,
-                ticket_qty,
-                travel_date,
-                train_nos,
-                is_scheduled,
-                scheduled_at,
-                requested_at,
-                request_source
+            cursor.execute(
+                """
+                INSERT INTO booking_requests (
+                    employee_id,
+                    id_number,
+                    from_station,
+                    to_station,
+                    trip_type,
+                    ticket_qty,
+                    travel_date,
+                    train_nos,
+                    is_scheduled,
+                    scheduled_at,
+                    requested_at,
+                    request_source
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    employee_id,
+                    id_number,
+                    from_station,
+                    to_station,
+                    trip_type,
+                    ticket_qty,
+                    travel_date,
+                    json.dumps(train_nos, ensure_ascii=False),
+                    1 if is_scheduled else 0,
+                    scheduled_at,
+                    requested_at,
+                    "MANUAL",
+                ),
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                employee_id,
-                id_number,
-                from_station,
-                to_station,
-                trip_type,
-                ticket_qty,
-                travel_date,
-                json.dumps(train_nos, ensure_ascii=False),
-                1 if is_scheduled else 0,
-                scheduled_at,
-                requested_at,
-                "MANUAL",
-            ),
-        )
 
-        conn.commit()
         return cursor.lastrowid
@@ -1,62 +1,258 @@
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 DB_PATH = Path(__file__).parent / "ticket.db"
 
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+EMPLOYEE_DB_PATH = DATA_DIR / "employees.db"
+STATION_DB_PATH = DATA_DIR / "stations.db"
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# =========================
+# 連線參數
+# =========================
+BUSY_TIMEOUT_MS = 5000      # 一般讀寫：SQLite 內建等待鎖的時間
+LOCK_ATTEMPT_MS = 100       # BEGIN IMMEDIATE：每次嘗試只等這麼久（不疊加 BUSY_TIMEOUT_MS）
+LOCK_RETRIES = 5            # BEGIN IMMEDIATE 取不到寫入鎖時的重試次數
+LOCK_RETRY_DELAY = 0.05     # 第一次重試的等待秒數（之後倍增）
+# 最長等待約 (LOCK_RETRIES + 1) × 0.1 s + 0.05 × (2^LOCK_RETRIES - 1) s ≈ 2.2 s
 
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+)
 
-def init_db():
-    conn = get_connection()
-    cursor = conn.cursor()
+READONLY_MMAP_SIZE = 64 * 1024 * 1024   # 唯讀參考資料以 mmap 讀取
+
+
+def _is_locked_error(e: sqlite3.OperationalError) -> bool:
+    msg = str(e).lower()
+    return "database is locked" in msg or "database is busy" in msg
+
+
+class ConnectionManager:
+    """
+    SQLite 連線管理
+    - 每個 thread、每個 DB 檔案各保留一條連線（不再每次 open / close）
+    - 連線建立時套用 WAL 與相關 PRAGMA
+    - transaction() 以 BEGIN IMMEDIATE 取得寫入鎖：每次只短暫等待，被鎖住時退避重試
+    """
+
+    def __init__(
+        self,
+        retries: int = LOCK_RETRIES,
+        retry_delay: float = LOCK_RETRY_DELAY,
+        attempt_timeout_ms: int = LOCK_ATTEMPT_MS,
+    ):
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.attempt_timeout_ms = attempt_timeout_ms
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: list[sqlite3.Connection] = []
+        self._readonly: dict[str, sqlite3.Connection] = {}
 
     # =========================
-    # UI 請求紀錄（只記 UI）
+    # Connection
     # =========================
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS ticket_request_log (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        employee_id TEXT NOT NULL,
-        id_number TEXT NOT NULL,
+    def get(self, db_path, attach: dict | None = None) -> sqlite3.Connection:
+        """
+        attach：{schema 名稱: 檔案路徑}，只在建立連線時唯讀 ATTACH
+        """
+        key = str(Path(db_path).resolve())
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+
+        conn = conns.get(key)
+        if conn is None:
+            conn = self._open(key, attach or {})
+            conns[key] = conn
+        return conn
+
+    def _open(self, path: str, attach: dict) -> sqlite3.Connection:
+        # isolation_level=None：交易由 transaction() 明確控制
+        conn = sqlite3.connect(
+            path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+            uri=True,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+
+        # 唯讀附掛：只用來 JOIN，寫入交易不會鎖到這些檔案
+        for schema, attach_path in attach.items():
+            attach_path = Path(attach_path).resolve()
+            if not attach_path.exists():
+                continue
+            conn.execute(
+                "ATTACH DATABASE ? AS " + schema,
+                (attach_path.as_uri() + "?mode=ro",),
+            )
 
-        start_station TEXT NOT NULL,
-        end_station TEXT NOT NULL,
+        with self._lock:
+            self._all.append(conn)
+        return conn
 
-        trip_type TEXT NOT NULL,               -- ONE_WAY / ROUND_TRIP
-        ticket_count INTEGER NOT NULL,
+    def readonly(self, db_path, reopen: bool = False) -> sqlite3.Connection:
+        """
+        唯讀參考資料（例：stations.db）：所有 thread 共用一條 immutable 連線
+        - immutable=1：SQLite 不取檔案鎖、不檢查其他連線的變更
+        - immutable 不讀 -wal：寫入端（migration / 資料集更新）寫完後須呼叫 checkpoint()
+        - 檔案內容改變後以 reopen=True 換上新連線；舊連線不主動關閉
+          （其他 thread 可能正在使用），沒有人引用後自動釋放
+        """
+        key = str(Path(db_path).resolve())
 
-        travel_date TEXT NOT NULL,
-        train_nos TEXT NOT NULL,               -- comma-separated
+        if not reopen:
+            with self._lock:
+                conn = self._readonly.get(key)
+            if conn is not None:
+                return conn
 
-        is_scheduled INTEGER NOT NULL,          -- 0 / 1
-        scheduled_at TEXT,                      -- nullable
+        conn = sqlite3.connect(
+            Path(key).as_uri() + "?mode=ro&immutable=1",
+            isolation_level=None,
+            check_same_thread=False,
+            uri=True,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {READONLY_MMAP_SIZE}")
+        conn.execute("PRAGMA query_only = ON")
 
-        requested_at TEXT NOT NULL              -- UI click time
-    )
-    """)
+        with self._lock:
+            existing = self._readonly.get(key)
+            if reopen or existing is None:
+                self._readonly[key] = conn
+                return conn
+        # 其他 thread 先開好了
+        conn.close()
+        return existing
 
     # =========================
-    # 訂票結果紀錄（你原本的）
+    # Transaction
     # =========================
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS ticket_order_log (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        employee_id TEXT,
-        order_time TEXT,
-        travel_date TEXT,
-        start_station TEXT,
-        end_station TEXT,
-        train_no TEXT,
-        ticket_qty INTEGER,
-        status TEXT,
-        message TEXT,
-        created_at TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    @contextmanager
+    def transaction(self, db_path):
+        """
+        寫入交易：成功 commit，例外 rollback
+        """
+        conn = self.get(db_path)
+
+        if conn.in_transaction:
+            # 巢狀呼叫：併入外層交易
+            yield conn
+            return
+
+        self._begin_immediate(conn)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def _begin_immediate(self, conn: sqlite3.Connection):
+        # 連線的 busy_timeout 給一般讀寫用；這裡改為短 timeout，等待由退避迴圈控制，
+        # 避免每次嘗試都在 SQLite 內再等滿 BUSY_TIMEOUT_MS（UI thread 會卡住很久）
+        conn.execute(f"PRAGMA busy_timeout = {int(self.attempt_timeout_ms)}")
+        try:
+            delay = self.retry_delay
+            for attempt in range(self.retries + 1):
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    return
+                except sqlite3.OperationalError as e:
+                    if not _is_locked_error(e) or attempt == self.retries:
+                        raise
+                    time.sleep(delay)
+                    delay *= 2
+        finally:
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+
+    # =========================
+    # Shutdown
+    # =========================
+    def close_all(self):
+        with self._lock:
+            conns, self._all = self._all, []
+            conns += self._readonly.values()
+            self._readonly = {}
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+_manager = ConnectionManager()
+
+
+def attached_databases() -> dict:
+    """
+    主資料庫（ticket.db）連線上唯讀附掛的資料庫
+    - employees.employees：員工
+    - stations.stations：站點
+    """
+    return {
+        "employees": EMPLOYEE_DB_PATH,
+        "stations": STATION_DB_PATH,
+    }
+
+
+def get_connection(db_path=None) -> sqlite3.Connection:
+    """
+    取得目前 thread 的共用連線（呼叫端不需要 close）
+    - ticket.db 的連線會附掛 attached_databases()，可直接跨庫 JOIN
+    """
+    path = Path(db_path or DB_PATH)
+    attach = None
+    if path.resolve() == Path(DB_PATH).resolve():
+        attach = attached_databases()
+    return _manager.get(path, attach)
+
+
+def get_readonly_connection(db_path=None, reopen: bool = False) -> sqlite3.Connection:
+    """
+    唯讀參考資料的共用連線（預設 stations.db）；跨 thread 共用，呼叫端不需要 close
+    """
+    return _manager.readonly(db_path or STATION_DB_PATH, reopen=reopen)
+
+
+def checkpoint(db_path):
+    """
+    把 WAL 寫回主檔並清空 -wal（唯讀 immutable 連線只看得到主檔）
+    - 只在寫入參考資料之後呼叫（init_db、資料集更新）
+    """
+    get_connection(db_path).execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def transaction(db_path=None):
+    # 先經過 get_connection，確保主資料庫的連線已附掛
+    get_connection(db_path)
+    return _manager.transaction(db_path or DB_PATH)
+
+
+def close_all_connections():
+    _manager.close_all()
+
+
+def init_db():
+    """
+    啟動時呼叫一次：把所有資料庫升級到最新 schema
+    """
+    from db.migrations import migrate_all
+
+    migrate_all()
+    checkpoint(STATION_DB_PATH)
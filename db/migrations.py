@@ -0,0 +1,840 @@
+"""
+Schema migration registry
+
+- 每個資料庫（ticket / employees / stations）各自一串有序的 migration
+- 已套用的版本記在 PRAGMA user_version
+- requires=(db_key, version)：需等另一個資料庫升級到該版本才執行
+  （例：stations 刪除 recent_stations 前，ticket 必須已複製過去）
+- 只在啟動時（init_db）或 repository 建構時執行；平常的讀寫不再碰 schema
+"""
+import json
+import sqlite3
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from db import database
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+    requires: tuple[str, int] | None = None
+
+
+_REGISTRY: dict[str, list[Migration]] = {}
+
+
+def migration(
+    db_key: str,
+    version: int,
+    description: str,
+    requires: tuple[str, int] | None = None,
+):
+    """
+    註冊一個 migration（decorator）
+    """
+    def decorator(fn):
+        steps = _REGISTRY.setdefault(db_key, [])
+        if any(m.version == version for m in steps):
+            raise ValueError(f"Duplicate migration {db_key} v{version}")
+        steps.append(Migration(version, description, fn, requires))
+        steps.sort(key=lambda m: m.version)
+        return fn
+
+    return decorator
+
+
+def database_path(db_key: str):
+    # 執行時才讀取路徑，方便測試替換 database.DB_PATH 等設定
+    return {
+        "ticket": database.DB_PATH,
+        "employees": database.EMPLOYEE_DB_PATH,
+        "stations": database.STATION_DB_PATH,
+    }[db_key]
+
+
+def latest_version(db_key: str) -> int:
+    steps = _REGISTRY.get(db_key, [])
+    return steps[-1].version if steps else 0
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _requirement_met(step: Migration, db_key: str, db_path=None) -> bool:
+    """
+    db_path：指定其他路徑升級時（例：暫存複本），依賴的資料庫取同目錄下的同名檔案
+    - 只讀 user_version，不經 ConnectionManager（不切換 WAL、不快取連線）
+    """
+    if step.requires is None:
+        return True
+    required_key, version = step.requires
+    path = Path(database_path(required_key))
+    if db_path is not None and (
+        Path(db_path).resolve() != Path(database_path(db_key)).resolve()
+    ):
+        path = Path(db_path).with_name(path.name)
+    if not path.exists():
+        return False
+
+    conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return current_version(conn) >= version
+    finally:
+        conn.close()
+
+
+def migrate(db_key: str, db_path=None) -> int:
+    """
+    將指定資料庫升級到最新版本，回傳升級後的版本
+    - 遇到 requires 尚未滿足的 migration 就停在前一版（下次再繼續）
+    """
+    path = db_path or database_path(db_key)
+    target = latest_version(db_key)
+
+    conn = database.get_connection(path)
+    if current_version(conn) >= target:
+        return current_version(conn)
+
+    with database.transaction(path) as conn:
+        # 取得寫入鎖後再讀一次：另一個 instance 可能已經升級過
+        version = current_version(conn)
+        for step in _REGISTRY.get(db_key, []):
+            if step.version <= version:
+                continue
+            if not _requirement_met(step, db_key, db_path):
+                break
+            step.apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(step.version)}")
+            version = step.version
+
+    return version
+
+
+def migrate_all():
+    # ticket.db 的連線會附掛其他資料庫，最後才開啟，確保附掛的檔案已存在
+    order = sorted(_REGISTRY, key=lambda k: k == "ticket")
+    for db_key in order:
+        migrate(db_key)
+
+    # 第二輪：等待其他資料庫（requires）而停下的 migration
+    for db_key in order:
+        migrate(db_key)
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+# =========================
+# ticket.db
+# =========================
+@migration("ticket", 1, "baseline request / order / booking tables")
+def _ticket_v1(conn: sqlite3.Connection):
+    # 舊版 init_db 建立的 ticket_request_log 欄位與 repository 不一致，先校正
+    cols = _columns(conn, "ticket_request_log")
+    if cols and "employee_id_number" not in cols:
+        conn.execute(
+            "ALTER TABLE ticket_request_log "
+            "RENAME COLUMN id_number TO employee_id_number"
+        )
+    if cols and "employee_name" not in cols:
+        conn.execute(
+            "ALTER TABLE ticket_request_log "
+            "ADD COLUMN employee_name TEXT NOT NULL DEFAULT ''"
+        )
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ticket_request_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+        -- 員工快照（避免跨 DB JOIN）
+        employee_id TEXT NOT NULL,
+        employee_name TEXT NOT NULL,
+        employee_id_number TEXT NOT NULL,
+
+        -- 訂票資訊
+        start_station TEXT NOT NULL,
+        end_station TEXT NOT NULL,
+        trip_type TEXT NOT NULL,               -- ONE_WAY / ROUND_TRIP
+        ticket_count INTEGER NOT NULL,
+        travel_date TEXT NOT NULL,
+        train_nos TEXT NOT NULL,               -- comma-separated
+
+        -- 排程
+        is_scheduled INTEGER NOT NULL,          -- 0 / 1
+        scheduled_at TEXT,
+
+        -- 時間
+        requested_at TEXT NOT NULL              -- UI click time
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ticket_order_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id TEXT,
+        order_time TEXT,
+        travel_date TEXT,
+        start_station TEXT,
+        end_station TEXT,
+        train_no TEXT,
+        ticket_qty INTEGER,
+        status TEXT,
+        message TEXT,
+        created_at TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS booking_requests (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id TEXT NOT NULL,
+        id_number TEXT NOT NULL,
+        from_station TEXT NOT NULL,
+        to_station TEXT NOT NULL,
+        trip_type TEXT NOT NULL,
+        ticket_qty INTEGER NOT NULL,
+        travel_date TEXT NOT NULL,
+        train_nos TEXT NOT NULL,               -- JSON array
+        is_scheduled INTEGER NOT NULL,
+        scheduled_at TEXT,
+        requested_at TEXT NOT NULL,
+        request_source TEXT NOT NULL
+    )
+    """)
+
+
+@migration("ticket", 2, "indexes for request / order log access patterns")
+def _ticket_v2(conn: sqlite3.Connection):
+    # 最近請求：ORDER BY requested_at DESC LIMIT ?
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_request_log_requested_at
+    ON ticket_request_log (requested_at)
+    """)
+
+    # 員工 + 乘車日期（含 status，狀態統計只需讀索引）
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_order_log_employee_date
+    ON ticket_order_log (employee_id, travel_date, status)
+    """)
+
+    # 依狀態查詢
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_order_log_status
+    ON ticket_order_log (status, travel_date)
+    """)
+
+
+@migration("ticket", 3, "drop employee snapshot requirement from request log")
+def _ticket_v3(conn: sqlite3.Connection):
+    # 員工姓名 / 身分證改由 JOIN employees.employees 取得，
+    # 快照欄位保留給舊資料（員工已刪除時仍可顯示），新資料不再寫入
+    conn.execute("""
+    CREATE TABLE ticket_request_log_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+        employee_id TEXT NOT NULL,
+        employee_name TEXT,                     -- legacy snapshot
+        employee_id_number TEXT,                -- legacy snapshot
+
+        start_station TEXT NOT NULL,
+        end_station TEXT NOT NULL,
+        trip_type TEXT NOT NULL,
+        ticket_count INTEGER NOT NULL,
+        travel_date TEXT NOT NULL,
+        train_nos TEXT NOT NULL,
+
+        is_scheduled INTEGER NOT NULL,
+        scheduled_at TEXT,
+
+        requested_at TEXT NOT NULL
+    )
+    """)
+    conn.execute("""
+    INSERT INTO ticket_request_log_new (
+        id, employee_id, employee_name, employee_id_number,
+        start_station, end_station, trip_type, ticket_count,
+        travel_date, train_nos, is_scheduled, scheduled_at, requested_at
+    )
+    SELECT
+        id, employee_id, employee_name, employee_id_number,
+        start_station, end_station, trip_type, ticket_count,
+        travel_date, train_nos, is_scheduled, scheduled_at, requested_at
+    FROM ticket_request_log
+    """)
+    conn.execute("DROP TABLE ticket_request_log")
+    conn.execute(
+        "ALTER TABLE ticket_request_log_new RENAME TO ticket_request_log"
+    )
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_request_log_requested_at
+    ON ticket_request_log (requested_at)
+    """)
+
+
+@migration("ticket", 4, "normalized train numbers for requests")
+def _ticket_v4(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ticket_request_train (
+        request_id INTEGER NOT NULL
+            REFERENCES ticket_request_log (id) ON DELETE CASCADE,
+        train_no TEXT NOT NULL,
+        travel_date TEXT NOT NULL,              -- YYYY-MM-DD（同 request）
+        PRIMARY KEY (request_id, train_no)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_request_train_lookup
+    ON ticket_request_train (train_no, travel_date, request_id)
+    """)
+
+    # 回填：拆開既有的逗號字串
+    rows = conn.execute(
+        "SELECT id, travel_date, train_nos FROM ticket_request_log"
+    ).fetchall()
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO ticket_request_train
+            (request_id, train_no, travel_date)
+        VALUES (?, ?, ?)
+        """,
+        [
+            (row_id, no.strip(), travel_date.replace("/", "-"))
+            for row_id, travel_date, train_nos in rows
+            for no in (train_nos or "").split(",")
+            if no.strip()
+        ],
+    )
+
+
+@migration("ticket", 5, "link order log rows to their request")
+def _ticket_v5(conn: sqlite3.Connection):
+    conn.execute("""
+    ALTER TABLE ticket_order_log
+    ADD COLUMN request_id INTEGER REFERENCES ticket_request_log (id)
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_order_log_request
+    ON ticket_order_log (request_id)
+    """)
+
+    # 請求 + 各車次結果（尚未送出的請求，結果欄位為 NULL）
+    conn.execute("""
+    CREATE VIEW IF NOT EXISTS ticket_request_history AS
+    SELECT
+        r.id AS request_id,
+        r.employee_id,
+        r.start_station,
+        r.end_station,
+        r.travel_date,
+        r.requested_at,
+        o.train_no,
+        o.status,
+        o.message,
+        o.created_at AS completed_at
+    FROM ticket_request_log r
+    LEFT JOIN ticket_order_log o ON o.request_id = r.id
+    """)
+
+
+@migration("ticket", 6, "duplicate-request guard on request train rows")
+def _ticket_v6(conn: sqlite3.Connection):
+    conn.execute("ALTER TABLE ticket_request_train ADD COLUMN employee_id TEXT")
+    conn.execute("""
+    ALTER TABLE ticket_request_train
+    ADD COLUMN status TEXT NOT NULL DEFAULT 'PENDING'
+    """)
+
+    conn.execute("""
+    UPDATE ticket_request_train
+    SET employee_id = (
+        SELECT r.employee_id FROM ticket_request_log r
+        WHERE r.id = ticket_request_train.request_id
+    )
+    """)
+
+    # 既有資料：有對應結果就沿用；查不到結果的舊請求標為 UNKNOWN，
+    # 避免被當成「處理中」而擋下新的請求
+    conn.execute("""
+    UPDATE ticket_request_train
+    SET status = COALESCE(
+        (
+            SELECT o.status FROM ticket_order_log o
+            WHERE o.request_id = ticket_request_train.request_id
+              AND o.train_no = ticket_request_train.train_no
+            ORDER BY o.id DESC LIMIT 1
+        ),
+        (
+            SELECT o.status FROM ticket_order_log o
+            WHERE o.employee_id = ticket_request_train.employee_id
+              AND REPLACE(o.travel_date, '/', '-')
+                  = ticket_request_train.travel_date
+              AND o.train_no = ticket_request_train.train_no
+            ORDER BY o.id DESC LIMIT 1
+        ),
+        'UNKNOWN'
+    )
+    """)
+
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_request_train_guard
+    ON ticket_request_train (employee_id, travel_date, train_no, status)
+    """)
+
+    # 寫入訂票結果時同步更新該車次的請求狀態
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_order_log_status
+    AFTER INSERT ON ticket_order_log
+    WHEN NEW.request_id IS NOT NULL
+    BEGIN
+        UPDATE ticket_request_train
+        SET status = NEW.status
+        WHERE request_id = NEW.request_id
+          AND train_no = NEW.train_no;
+    END
+    """)
+
+
+@migration("ticket", 7, "incrementally maintained daily booking statistics")
+def _ticket_v7(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ticket_daily_stats (
+        employee_id TEXT NOT NULL,
+        day TEXT NOT NULL,                      -- YYYY-MM-DD
+        requests INTEGER NOT NULL DEFAULT 0,
+        successes INTEGER NOT NULL DEFAULT 0,
+        failures INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (employee_id, day)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_daily_stats_day
+    ON ticket_daily_stats (day)
+    """)
+
+    # day 不可為 NULL：時間無法解析的紀錄不計入統計；
+    # 訂票結果沒有 created_at 時改用 order_time
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_request_log_daily_stats
+    AFTER INSERT ON ticket_request_log
+    WHEN date(NEW.requested_at) IS NOT NULL
+    BEGIN
+        INSERT INTO ticket_daily_stats (employee_id, day, requests)
+        VALUES (NEW.employee_id, date(NEW.requested_at), 1)
+        ON CONFLICT (employee_id, day)
+        DO UPDATE SET requests = requests + 1;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_order_log_daily_stats
+    AFTER INSERT ON ticket_order_log
+    WHEN NEW.employee_id IS NOT NULL
+     AND COALESCE(date(NEW.created_at), date(NEW.order_time)) IS NOT NULL
+    BEGIN
+        INSERT INTO ticket_daily_stats (employee_id, day, successes, failures)
+        VALUES (
+            NEW.employee_id,
+            COALESCE(date(NEW.created_at), date(NEW.order_time)),
+            NEW.status = 'SUCCESS',
+            NEW.status = 'FAILED'
+        )
+        ON CONFLICT (employee_id, day)
+        DO UPDATE SET
+            successes = successes + excluded.successes,
+            failures = failures + excluded.failures;
+    END
+    """)
+
+    # 既有紀錄回填（migration 不引用 repository，SQL 固定在此版本）
+    conn.execute("DELETE FROM ticket_daily_stats")
+    conn.execute("""
+    INSERT INTO ticket_daily_stats (
+        employee_id, day, requests, successes, failures
+    )
+    SELECT employee_id, day, SUM(requests), SUM(successes), SUM(failures)
+    FROM (
+        SELECT employee_id, date(requested_at) AS day,
+               1 AS requests, 0 AS successes, 0 AS failures
+        FROM ticket_request_log
+
+        UNION ALL
+
+        SELECT employee_id,
+               COALESCE(date(created_at), date(order_time)) AS day,
+               0, status = 'SUCCESS', status = 'FAILED'
+        FROM ticket_order_log
+        WHERE employee_id IS NOT NULL
+    )
+    WHERE day IS NOT NULL
+    GROUP BY employee_id, day
+    """)
+
+
+@migration("ticket", 8, "route popularity (origin -> destination) statistics")
+def _ticket_v8(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ticket_route_stats (
+        start_station TEXT NOT NULL,
+        end_station TEXT NOT NULL,
+        requests INTEGER NOT NULL DEFAULT 0,
+        last_used TEXT NOT NULL,
+        PRIMARY KEY (start_station, end_station)
+    ) WITHOUT ROWID
+    """)
+    # 依起站取最常用的迄站，不需排序
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_ticket_route_stats_popular
+    ON ticket_route_stats (start_station, requests DESC, last_used DESC)
+    """)
+
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_request_log_route_stats
+    AFTER INSERT ON ticket_request_log
+    BEGIN
+        INSERT INTO ticket_route_stats (
+            start_station, end_station, requests, last_used
+        )
+        VALUES (NEW.start_station, NEW.end_station, 1, NEW.requested_at)
+        ON CONFLICT (start_station, end_station)
+        DO UPDATE SET
+            requests = requests + 1,
+            last_used = max(last_used, excluded.last_used);
+    END
+    """)
+
+    # 既有紀錄回填（migration 不引用 repository，SQL 固定在此版本）
+    conn.execute("DELETE FROM ticket_route_stats")
+    conn.execute("""
+    INSERT INTO ticket_route_stats (
+        start_station, end_station, requests, last_used
+    )
+    SELECT start_station, end_station, COUNT(*), MAX(requested_at)
+    FROM ticket_request_log
+    GROUP BY start_station, end_station
+    """)
+
+
+@migration("ticket", 9, "move recent_stations out of the read-only stations.db")
+def _ticket_v9(conn: sqlite3.Connection):
+    # stations.db 只放唯讀參考資料；會變動的最近使用紀錄改存 ticket.db
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS recent_stations (
+        code TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        used_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        use_count INTEGER NOT NULL DEFAULT 0,
+        score REAL NOT NULL DEFAULT 0,
+        scored_at REAL
+    )
+    """)
+
+    # 由附掛的 stations.db 帶入既有紀錄（stations migration 已先執行）
+    attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+    if "stations" not in attached:
+        return
+    columns = {
+        row[1] for row in conn.execute("PRAGMA stations.table_info(recent_stations)")
+    }
+    if "scored_at" not in columns:
+        return
+
+    conn.execute("""
+    INSERT OR IGNORE INTO main.recent_stations (
+        code, name, used_at, use_count, score, scored_at
+    )
+    SELECT code, name, used_at, use_count, score, scored_at
+    FROM stations.recent_stations
+    """)
+
+
+@migration("ticket", 10, "offline TRA timetable (stops by date / train / sequence)")
+def _ticket_v10(conn: sqlite3.Connection):
+    # 查某日某車次的停靠站：主鍵前綴 (train_date, train_no) 即可
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS timetable_stop (
+        train_date TEXT NOT NULL,               -- YYYY-MM-DD
+        train_no TEXT NOT NULL,
+        stop_seq INTEGER NOT NULL,
+        station_code TEXT NOT NULL,
+        arrival_time TEXT,
+        departure_time TEXT,
+        PRIMARY KEY (train_date, train_no, stop_seq)
+    ) WITHOUT ROWID
+    """)
+
+    # 已匯入的日期（沒有時刻表的日期不做車次檢查）
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS timetable_date (
+        train_date TEXT PRIMARY KEY,
+        trains INTEGER NOT NULL,
+        source TEXT,
+        imported_at TEXT NOT NULL
+    )
+    """)
+
+# 車次去掉前導 0（同 repository.timetable_repo.normalize_train_no）
+_TRAIN_NO_SQL = "COALESCE(NULLIF(ltrim(trim({}), '0'), ''), '0')"
+
+
+@migration("ticket", 11, "compare request train numbers without leading zeros")
+def _ticket_v11(conn: sqlite3.Connection):
+    # 0402 與 402 是同一車次：同一請求中正規化後重複的只留一筆
+    normalized = _TRAIN_NO_SQL.format("train_no")
+    conn.execute(f"""
+    DELETE FROM ticket_request_train
+    WHERE EXISTS (
+        SELECT 1 FROM ticket_request_train k
+        WHERE k.request_id = ticket_request_train.request_id
+          AND {_TRAIN_NO_SQL.format("k.train_no")}
+              = {_TRAIN_NO_SQL.format("ticket_request_train.train_no")}
+          AND k.train_no < ticket_request_train.train_no
+    )
+    """)
+    conn.execute(f"""
+    UPDATE ticket_request_train
+    SET train_no = {normalized}
+    WHERE train_no <> {normalized}
+    """)
+
+    # v6 以原樣比對訂票結果；因前導 0 而對不上的舊請求重新比對一次
+    order_no = _TRAIN_NO_SQL.format("o.train_no")
+    conn.execute(f"""
+    UPDATE ticket_request_train
+    SET status = COALESCE(
+        (
+            SELECT o.status FROM ticket_order_log o
+            WHERE o.request_id = ticket_request_train.request_id
+              AND {order_no} = ticket_request_train.train_no
+            ORDER BY o.id DESC LIMIT 1
+        ),
+        (
+            SELECT o.status FROM ticket_order_log o
+            WHERE o.employee_id = ticket_request_train.employee_id
+              AND REPLACE(o.travel_date, '/', '-')
+                  = ticket_request_train.travel_date
+              AND {order_no} = ticket_request_train.train_no
+            ORDER BY o.id DESC LIMIT 1
+        ),
+        'UNKNOWN'
+    )
+    WHERE status = 'UNKNOWN'
+    """)
+
+    # 訂票結果的車次是使用者輸入的原樣，比對時同樣正規化
+    conn.execute("DROP TRIGGER IF EXISTS trg_ticket_order_log_status")
+    conn.execute(f"""
+    CREATE TRIGGER trg_ticket_order_log_status
+    AFTER INSERT ON ticket_order_log
+    WHEN NEW.request_id IS NOT NULL
+    BEGIN
+        UPDATE ticket_request_train
+        SET status = NEW.status
+        WHERE request_id = NEW.request_id
+          AND train_no = {_TRAIN_NO_SQL.format("NEW.train_no")};
+    END
+    """)
+
+# =========================
+# employees.db
+# =========================
+@migration("employees", 1, "baseline employees table")
+def _employees_v1(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS employees (
+        emp_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        department TEXT NOT NULL,
+        id_number TEXT NOT NULL,
+        is_active INTEGER NOT NULL,
+        hired_date TEXT
+    )
+    """)
+
+
+@migration("employees", 2, "indexes for filtered / paged employee listing")
+def _employees_v2(conn: sqlite3.Connection):
+    # 只含在職員工的 partial index
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_employees_active
+    ON employees (emp_id) WHERE is_active = 1
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_employees_department
+    ON employees (department, emp_id)
+    """)
+    # 姓名前綴：依 (name, emp_id) 分頁，索引順序即輸出順序
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_employees_name
+    ON employees (name, emp_id)
+    """)
+
+
+@migration("employees", 3, "full-text search index over emp_id / name / department")
+def _employees_v3(conn: sqlite3.Connection):
+    # trigram：任意 3 字以上的子字串都能走索引（「王小明」「001」）；
+    # unicode61 會把整個中文姓名當成一個 token，只能前綴比對
+    # SQLite 未編入 FTS5 / trigram（3.34 前）時略過；EmployeeRepository.search() 改用 LIKE
+    try:
+        conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5 (
+            emp_id, name, department,
+            content = 'employees',
+            content_rowid = 'rowid',
+            tokenize = 'trigram'
+        )
+        """)
+    except sqlite3.OperationalError:
+        return
+
+    # external content：由 trigger 同步，任何寫入 employees 的程式都不會漏
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_fts_insert
+    AFTER INSERT ON employees
+    BEGIN
+        INSERT INTO employees_fts (rowid, emp_id, name, department)
+        VALUES (new.rowid, new.emp_id, new.name, new.department);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_fts_delete
+    AFTER DELETE ON employees
+    BEGIN
+        INSERT INTO employees_fts (employees_fts, rowid, emp_id, name, department)
+        VALUES ('delete', old.rowid, old.emp_id, old.name, old.department);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_fts_update
+    AFTER UPDATE OF emp_id, name, department ON employees
+    BEGIN
+        INSERT INTO employees_fts (employees_fts, rowid, emp_id, name, department)
+        VALUES ('delete', old.rowid, old.emp_id, old.name, old.department);
+        INSERT INTO employees_fts (rowid, emp_id, name, department)
+        VALUES (new.rowid, new.emp_id, new.name, new.department);
+    END
+    """)
+
+    conn.execute("INSERT INTO employees_fts (employees_fts) VALUES ('rebuild')")
+
+
+# =========================
+# stations.db
+# =========================
+@migration("stations", 1, "baseline stations / recent_stations tables")
+def _stations_v1(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS stations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT NOT NULL,
+        name TEXT NOT NULL
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS recent_stations (
+        code TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        used_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+@migration("stations", 2, "index stations by code for cross-database joins")
+def _stations_v2(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_stations_code
+    ON stations (code)
+    """)
+
+
+@migration("stations", 3, "normalized search_key (臺/台, full-width folding)")
+def _stations_v3(conn: sqlite3.Connection):
+    from core.text import fold_text
+
+    if "search_key" not in _columns(conn, "stations"):
+        conn.execute("ALTER TABLE stations ADD COLUMN search_key TEXT")
+
+    rows = conn.execute("SELECT id, name FROM stations").fetchall()
+    conn.executemany(
+        "UPDATE stations SET search_key = ? WHERE id = ?",
+        [(fold_text(name), row_id) for row_id, name in rows],
+    )
+
+
+@migration("stations", 4, "English / romanized station names from data/station_names.json")
+def _stations_v4(conn: sqlite3.Connection):
+    columns = _columns(conn, "stations")
+    for column in ("name_en", "name_pinyin"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE stations ADD COLUMN {column} TEXT")
+
+    path = database.DATA_DIR / "station_names.json"
+    if not path.exists():
+        return
+
+    with open(path, encoding="utf-8") as f:
+        names = json.load(f)["stations"]
+
+    conn.executemany(
+        "UPDATE stations SET name_en = ?, name_pinyin = ? WHERE code = ?",
+        [(n["en"], n["pinyin"], code) for code, n in names.items()],
+    )
+
+
+@migration("stations", 5, "frecency columns on recent_stations")
+def _stations_v5(conn: sqlite3.Connection):
+    columns = _columns(conn, "recent_stations")
+    if "use_count" not in columns:
+        conn.execute(
+            "ALTER TABLE recent_stations ADD COLUMN use_count INTEGER NOT NULL DEFAULT 0"
+        )
+    if "score" not in columns:
+        conn.execute(
+            "ALTER TABLE recent_stations ADD COLUMN score REAL NOT NULL DEFAULT 0"
+        )
+    if "scored_at" not in columns:
+        # score 計算時間點（unix epoch 秒），衰減由此起算
+        conn.execute("ALTER TABLE recent_stations ADD COLUMN scored_at REAL")
+
+    # 既有紀錄視為使用過一次
+    conn.execute("""
+    UPDATE recent_stations
+    SET use_count = 1,
+        score = 1.0,
+        scored_at = CAST(strftime('%s', used_at) AS REAL)
+    WHERE scored_at IS NULL
+    """)
+
+
+@migration("stations", 6, "UNIQUE(code) after de-duplication, dataset metadata")
+def _stations_v6(conn: sqlite3.Connection):
+    # 舊版初始化腳本重跑時會重複 INSERT：同一站碼只留最早的一筆
+    conn.execute("""
+    DELETE FROM stations
+    WHERE id NOT IN (SELECT MIN(id) FROM stations GROUP BY code)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_stations_code")
+    conn.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_stations_code
+    ON stations (code)
+    """)
+
+    # 已載入的站點資料集版本（services.station_dataset）
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS dataset_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """)
+
+
+@migration(
+    "stations", 7, "drop recent_stations (moved to ticket.db)",
+    requires=("ticket", 9),
+)
+def _stations_v7(conn: sqlite3.Connection):
+    # ticket v9 已把紀錄複製到 ticket.db；stations.db 只留唯讀參考資料
+    conn.execute("DROP TABLE IF EXISTS recent_stations")
@@ -1,37 +1,4 @@
-from datetime import datetime
-from db.database import get_connection
+# 舊路徑相容：實作統一在 repository/ticket_log_repo.py
+from repository.ticket_log_repo import TicketLogRepository
 
-class TicketLogRepository:
-
-    @staticmethod
-    def insert(
-        employee_id,
-        travel_date,
-        start_station,
-        end_station,
-        train_no,
-        ticket_qty,
-        status,
-        message=""
-    ):
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        cursor.execute("""
-        INSERT INTO ticket_order_log (
-            employee_id, order_time, travel_date,
-            start_station, end_station,
-            train_no, ticket_qty,
-            status, message, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            employee_id, now, travel_date,
-            start_station, end_station,
-            train_no, ticket_qty,
-            status, message, now
-        ))
-
-        conn.commit()
-        conn.close()
+__all__ = ["TicketLogRepository"]
@@ -1,10 +1,14 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date
 from typing import Optional
 import re
 
 
+# 身分證字號：1 英文字母 + 性別碼 1/2 + 8 碼數字
+_ID_NUMBER_RE = re.compile(r"[A-Z][12]\d{8}")
+
+
 class InvalidEmployeeError(ValueError):
     """
     Employee Domain 驗證失敗時拋出的例外
@@ -12,7 +16,7 @@ class InvalidEmployeeError(ValueError):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Employee:
     """
     Employee Domain Model
@@ -21,6 +25,7 @@ class Employee:
     - 只描述「員工是什麼」
     - 不處理 IO / DB / UI
     - 所有欄位在此即為業務真相
+    - 一般建構會驗證；已驗證過的資料（DB 讀回、狀態切換）走 hydrate()
     """
 
     emp_id: str
@@ -65,10 +70,41 @@ class Employee:
             raise InvalidEmployeeError("department length must be <= 50")
         
     def _validate_id_number(self):
-        pattern = r"^[A-Z][12]\d{8}$"
-        if not re.match(pattern, self.id_number):
+        if not isinstance(self.id_number, str) or not _ID_NUMBER_RE.fullmatch(
+            self.id_number
+        ):
             raise InvalidEmployeeError("身分證字號格式錯誤")
 
+    # =========================
+    # Trusted construction
+    # =========================
+
+    @classmethod
+    def hydrate(
+        cls,
+        emp_id: str,
+        name: str,
+        id_number: str,
+        department: str,
+        is_active: bool = True,
+        hired_date: Optional[date] = None,
+    ) -> Employee:
+        """
+        不經驗證直接建立 instance
+        - 僅供已驗證過的來源使用（repository 讀回的資料、既有 instance 的複本）
+        - 外部輸入一律使用 Employee(...)
+        """
+        # 直接寫入 slot（繞過 frozen 的 __setattr__）；依欄位名稱，不依順序
+        obj = object.__new__(cls)
+        setters = _SLOT_SETTERS
+        setters["emp_id"](obj, emp_id)
+        setters["name"](obj, name)
+        setters["id_number"](obj, id_number)
+        setters["department"](obj, department)
+        setters["is_active"](obj, is_active)
+        setters["hired_date"](obj, hired_date)
+        return obj
+
     # =========================
     # Domain behaviors
     # =========================
@@ -80,7 +116,7 @@ class Employee:
         if not self.is_active:
             return self
 
-        return Employee(
+        return Employee.hydrate(
             emp_id=self.emp_id,
             name=self.name,
             id_number=self.id_number,
@@ -96,7 +132,7 @@ class Employee:
         if self.is_active:
             return self
 
-        return Employee(
+        return Employee.hydrate(
             emp_id=self.emp_id,
             name=self.name,
             id_number=self.id_number,
@@ -104,3 +140,7 @@ class Employee:
             is_active=True,
             hired_date=self.hired_date,
         )
+
+
+# 欄位名稱 → slot descriptor 的 __set__
+_SLOT_SETTERS = {f.name: getattr(Employee, f.name).__set__ for f in fields(Employee)}
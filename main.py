@@ -1,6 +1,7 @@
 import sys
 from PySide6.QtWidgets import QApplication
-from db.database import init_db
+from db.database import init_db, close_all_connections
+from repository.ticket_log_repo import shutdown_log_writer
 
 
 def main():
@@ -11,10 +12,13 @@ def main():
     window = MainWindow()
     window.show()
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    window.station_controller.close()
+    shutdown_log_writer()
+    close_all_connections()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
     init_db()
     main()
-
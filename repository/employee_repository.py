@@ -1,7 +1,10 @@
 import sqlite3
+from datetime import date
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+from db.database import EMPLOYEE_DB_PATH, get_connection, transaction
+from db.migrations import migrate
 from domain.employee import Employee
 
 
@@ -10,17 +13,21 @@ class EmployeeRepository:
     Employee Repository
     - 負責 Employee 的資料存取
     - 僅接受 / 回傳 Employee domain object
+    - 讀取走記憶體快取（emp_id → Employee），第一次讀取時整批載入；
+      add / update / delete 成功後同步更新快取
     """
 
     def __init__(self, db_path: Optional[str] = None):
         if db_path is None:
-            base_dir = Path(__file__).resolve().parents[1]
-            data_dir = base_dir / "data"
-            data_dir.mkdir(exist_ok=True)
-            self.db_path = data_dir / "employees.db"
+            EMPLOYEE_DB_PATH.parent.mkdir(exist_ok=True)
+            self.db_path = EMPLOYEE_DB_PATH
         else:
             self.db_path = Path(db_path)
 
+        self._cache: dict[str, Employee] | None = None
+        self._ordered: list[Employee] | None = None
+        self._fts: bool | None = None
+
         self._init_db()
 
     # =========================
@@ -28,25 +35,65 @@ class EmployeeRepository:
     # =========================
 
     def _get_conn(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        return get_connection(self.db_path)
 
     def _init_db(self):
         """
-        初始化資料表（若不存在）
+        套用 employees schema migration（已是最新版本時只讀一次 user_version）
         """
-        with self._get_conn() as conn:
-            conn.execute(
+        migrate("employees", self.db_path)
+
+    # =========================
+    # Cache
+    # =========================
+
+    def _employees(self) -> dict[str, Employee]:
+        if self._cache is None:
+            rows = self._get_conn().execute(
                 """
-                CREATE TABLE IF NOT EXISTS employees (
-                    emp_id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    department TEXT NOT NULL,
-                    id_number TEXT NOT NULL,
-                    is_active INTEGER NOT NULL,
-                    hired_date TEXT
-                )
+                SELECT
+                    emp_id,
+                    name,
+                    department,
+                    id_number,
+                    is_active,
+                    hired_date
+                FROM employees
+                ORDER BY emp_id
                 """
-            )
+            ).fetchall()
+            self._cache = {r[0]: self._to_employee(r) for r in rows}
+            self._ordered = None
+        return self._cache
+
+    def _cache_put(self, employee: Employee):
+        if self._cache is not None:
+            self._cache[employee.emp_id] = employee
+        self._ordered = None
+
+    def _cache_pop(self, emp_id: str):
+        if self._cache is not None:
+            self._cache.pop(emp_id, None)
+        self._ordered = None
+
+    def invalidate_cache(self):
+        """
+        丟棄快取（例如其他程式修改了資料庫），下次讀取時重新載入
+        """
+        self._cache = None
+        self._ordered = None
+
+    @staticmethod
+    def _to_employee(row) -> Employee:
+        # 寫入前已驗證過，讀回時不再重跑驗證
+        return Employee.hydrate(
+            emp_id=row[0],
+            name=row[1],
+            department=row[2],
+            id_number=row[3],
+            is_active=bool(row[4]),
+            hired_date=date.fromisoformat(row[5]) if row[5] else None,
+        )
 
     # =========================
     # CRUD operations
@@ -57,7 +104,7 @@ class EmployeeRepository:
         新增員工
         """
         try:
-            with self._get_conn() as conn:
+            with transaction(self.db_path) as conn:
                 conn.execute(
                     """
                     INSERT INTO employees (
@@ -85,74 +132,287 @@ class EmployeeRepository:
                 f"Employee with emp_id '{employee.emp_id}' already exists"
             ) from e
 
+        self._cache_put(employee)
+
+    def add_many(self, employees: list[Employee]) -> list[str]:
+        """
+        同一個交易批次新增
+        - 已存在的 emp_id 以 ON CONFLICT DO NOTHING 略過（不受 SQL 變數數量上限影響）
+        - 不把新資料放進快取（大量匯入時會撐大記憶體）；有寫入就丟棄快取
+        - 回傳被略過的 emp_id
+        """
+        skipped = []
+
+        with transaction(self.db_path) as conn:
+            for e in employees:
+                cur = conn.execute(
+                    """
+                    INSERT INTO employees (
+                        emp_id,
+                        name,
+                        department,
+                        id_number,
+                        is_active,
+                        hired_date
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (emp_id) DO NOTHING
+                    """,
+                    (
+                        e.emp_id,
+                        e.name,
+                        e.department,
+                        e.id_number,
+                        int(e.is_active),
+                        e.hired_date.isoformat() if e.hired_date else None,
+                    ),
+                )
+                if cur.rowcount == 0:
+                    skipped.append(e.emp_id)
+
+        if len(skipped) < len(employees):
+            self.invalidate_cache()
+        return skipped
+
     def get(self, emp_id: str) -> Optional[Employee]:
         """
         依 emp_id 取得 Employee
         """
-        with self._get_conn() as conn:
-            row = conn.execute(
-                """
-                SELECT
-                    emp_id,
-                    name,
-                    department,
-                    id_number,
-                    is_active,
-                    hired_date
-                FROM employees
-                WHERE emp_id = ?
-                """,
-                (emp_id,),
-            ).fetchone()
+        return self._employees().get(emp_id)
 
-        if row is None:
-            return None
+    def list_all(self) -> list[Employee]:
+        """
+        取得全部員工（依 emp_id 排序）
+        """
+        if self._ordered is None:
+            employees = self._employees()
+            self._ordered = [employees[k] for k in sorted(employees)]
+        return list(self._ordered)
 
-        return Employee(
-            emp_id=row[0],
-            name=row[1],
-            department=row[2],
-            id_number=row[3],
-            is_active=bool(row[4]),
-            hired_date=None,
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Employee]:
+        """
+        依 emp_id 逐批讀出（fetchmany），不經過快取、不一次載入
+        """
+        cursor = self._get_conn().execute(
+            """
+            SELECT
+                emp_id,
+                name,
+                department,
+                id_number,
+                is_active,
+                hired_date
+            FROM employees
+            ORDER BY emp_id
+            """
         )
+        try:
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield self._to_employee(row)
+        finally:
+            cursor.close()
 
-    def list_all(self) -> list[Employee]:
+    @staticmethod
+    def build_query(
+        *,
+        active_only: bool = False,
+        department: str | None = None,
+        name_prefix: str | None = None,
+        after: str | tuple[str, str] | None = None,
+        limit: int | None = 100,
+    ) -> tuple[str, list]:
         """
-        取得全部員工
+        組出 query() 使用的 SQL（索引）
+        - active_only：idx_employees_active（partial index）
+        - department：idx_employees_department
+        - name_prefix：idx_employees_name（範圍查詢，依 (name, emp_id) 排序）
         """
-        with self._get_conn() as conn:
-            rows = conn.execute(
-                """
-                SELECT
-                    emp_id,
-                    name,
-                    department,
-                    id_number,
-                    is_active,
-                    hired_date
-                FROM employees
-                ORDER BY emp_id
-                """
-            ).fetchall()
+        where = []
+        params: list = []
+
+        if active_only:
+            # 必須是字面值 1，planner 才會選用 partial index
+            where.append("is_active = 1")
+        if department:
+            where.append("department = ?")
+            params.append(department)
+        if name_prefix and after:
+            # 由上一頁最後的姓名開始 seek（row value 比較不會成為索引範圍的起點）
+            after_name, after_id = after
+            where.append("name >= ? AND name < ? AND (name > ? OR emp_id > ?)")
+            params += [after_name, name_prefix + "\U0010ffff", after_name, after_id]
+        elif name_prefix:
+            where.append("name >= ? AND name < ?")
+            params += [name_prefix, name_prefix + "\U0010ffff"]
+        elif after:
+            where.append("emp_id > ?")
+            params.append(after)
+
+        sql = """
+        SELECT
+            emp_id,
+            name,
+            department,
+            id_number,
+            is_active,
+            hired_date
+        FROM employees
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # 排序與索引一致，每頁只讀該頁的列，不需暫存排序
+        sql += " ORDER BY name, emp_id" if name_prefix else " ORDER BY emp_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return sql, params
+
+    def query(
+        self,
+        *,
+        active_only: bool = False,
+        department: str | None = None,
+        name_prefix: str | None = None,
+        after: str | tuple[str, str] | None = None,
+        limit: int | None = 100,
+    ) -> list[Employee]:
+        """
+        在 SQL 端篩選 + 分頁（依 emp_id 排序；有 name_prefix 時依姓名、emp_id）
+        - after：上一頁最後一筆的 page_key()
+        - limit：None 表示不分頁
+        """
+        sql, params = self.build_query(
+            active_only=active_only,
+            department=department,
+            name_prefix=name_prefix,
+            after=after,
+            limit=limit,
+        )
+        rows = self._get_conn().execute(sql, params).fetchall()
+
+        # 已在快取中的員工直接沿用，不重建物件
+        cached = self._cache or {}
+        return [cached.get(r[0]) or self._to_employee(r) for r in rows]
+
+    @staticmethod
+    def page_key(employee: Employee, *, name_prefix: str | None = None):
+        """
+        下一頁的 after：依姓名分頁時為 (name, emp_id)，否則為 emp_id
+        """
+        if name_prefix:
+            return employee.name, employee.emp_id
+        return employee.emp_id
+
+    # =========================
+    # Search
+    # =========================
+
+    # bm25 權重：emp_id > name > department
+    SEARCH_FTS_SQL = """
+    SELECT
+        e.emp_id,
+        e.name,
+        e.department,
+        e.id_number,
+        e.is_active,
+        e.hired_date
+    FROM employees_fts f
+    JOIN employees e ON e.rowid = f.rowid
+    WHERE employees_fts MATCH ?
+    {active}
+    ORDER BY bm25(employees_fts, 10.0, 5.0, 1.0), e.emp_id
+    LIMIT ?
+    """
+
+    # 未編入 FTS5 / 詞短於 3 字（trigram 無法比對）時的替代方案（包含比對）
+    # 每個詞一組 (emp_id OR name OR department) LIKE，詞之間 AND
+    SEARCH_LIKE_SQL = """
+    SELECT
+        emp_id,
+        name,
+        department,
+        id_number,
+        is_active,
+        hired_date
+    FROM employees e
+    WHERE {terms}
+    {active}
+    ORDER BY emp_id
+    LIMIT ?
+    """
+
+    SEARCH_LIKE_TERM = (
+        "(emp_id LIKE ? ESCAPE '\\'"
+        " OR name LIKE ? ESCAPE '\\'"
+        " OR department LIKE ? ESCAPE '\\')"
+    )
 
-        return [
-            Employee(
-                emp_id=r[0],
-                name=r[1],
-                department=r[2],
-                id_number=r[3],
-                is_active=bool(r[4]),
-                hired_date=None,
+    # trigram tokenizer 可比對的最短字數
+    FTS_MIN_TERM = 3
+
+    def has_fts(self) -> bool:
+        if self._fts is None:
+            self._fts = self._get_conn().execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'"
+            ).fetchone() is not None
+        return self._fts
+
+    @staticmethod
+    def match_expression(text: str) -> str:
+        """
+        使用者輸入 → FTS5 MATCH 語法（trigram：子字串比對）
+        - 以空白分詞，每個詞都必須命中（AND）
+        - 詞以雙引號包住，避免 - : * 等字元被當成運算子
+        """
+        terms = text.split()
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    def search(
+        self,
+        text: str,
+        *,
+        active_only: bool = False,
+        limit: int = 50,
+    ) -> list[Employee]:
+        """
+        依 emp_id / 姓名 / 部門搜尋（包含即可，「小明」找得到「王小明」）
+        - 每個詞都 3 字以上：FTS5 trigram，依相關度排序
+        - 否則（或未編入 FTS5）：LIKE 包含比對，依 emp_id 排序
+        """
+        terms = text.split()
+        if not terms:
+            return []
+
+        active = "AND e.is_active = 1" if active_only else ""
+        if self.has_fts() and all(len(t) >= self.FTS_MIN_TERM for t in terms):
+            rows = self._get_conn().execute(
+                self.SEARCH_FTS_SQL.format(active=active),
+                (self.match_expression(text), limit),
+            ).fetchall()
+        else:
+            params = []
+            for term in terms:
+                pattern = "%" + (
+                    term.replace("\\", "\\\\")
+                    .replace("%", "\\%")
+                    .replace("_", "\\_")
+                ) + "%"
+                params += [pattern, pattern, pattern]
+            sql = self.SEARCH_LIKE_SQL.format(
+                terms=" AND ".join([self.SEARCH_LIKE_TERM] * len(terms)),
+                active=active,
             )
-            for r in rows
-        ]
+            rows = self._get_conn().execute(sql, (*params, limit)).fetchall()
+
+        cached = self._cache or {}
+        return [cached.get(r[0]) or self._to_employee(r) for r in rows]
 
     def update(self, employee: Employee) -> None:
         """
         更新既有員工（以 emp_id 為 key）
         """
-        with self._get_conn() as conn:
+        with transaction(self.db_path) as conn:
             cur = conn.execute(
                 """
                 UPDATE employees
@@ -181,20 +441,19 @@ class EmployeeRepository:
                     f"Employee with emp_id '{employee.emp_id}' does not exist"
                 )
 
+        self._cache_put(employee)
+
     def delete(self, emp_id: str) -> None:
         """
         刪除員工（實體刪除）
         """
-        with self._get_conn() as conn:
+        with transaction(self.db_path) as conn:
             conn.execute(
                 "DELETE FROM employees WHERE emp_id = ?",
                 (emp_id,),
             )
 
+        self._cache_pop(emp_id)
+
     def exists(self, emp_id: str) -> bool:
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT 1 FROM employees WHERE emp_id = ? LIMIT 1",
-                (emp_id,)
-            )
-            return cur.fetchone() is not None
+        return emp_id in self._employees()
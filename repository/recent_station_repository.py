@@ -1,38 +1,67 @@
-import sqlite3
-from pathlib import Path
+from typing import Iterable
+
+from db.database import get_connection, transaction
+
 
 class RecentStationRepository:
-    def __init__(self):
-        db_path = Path(__file__).parent.parent / "data" / "stations.db"
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-        self._init_table()
-
-    def _init_table(self):
-        cursor = self.conn.cursor()
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS recent_stations (
-            code TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            used_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-        """)
-        self.conn.commit()
+    """
+    最近使用車站（ticket.db 的 recent_stations，由 db.migrations 建立）
+    - 與唯讀的 stations.db 分開存放
+    - 連線由 ConnectionManager 依 thread 管理，可在背景 thread 寫入
+    """
+
+    def __init__(self, db_path=None):
+        # None：ticket.db（DB_PATH）
+        self.db_path = db_path
+
+    UPSERT_SQL = """
+    INSERT INTO main.recent_stations (code, name, used_at, use_count, score, scored_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (code) DO UPDATE SET
+        name = excluded.name,
+        used_at = excluded.used_at,
+        use_count = excluded.use_count,
+        score = excluded.score,
+        scored_at = excluded.scored_at
+    """
 
     def record(self, code, name):
-        cursor = self.conn.cursor()
-        cursor.execute("""
-        INSERT OR REPLACE INTO recent_stations (code, name, used_at)
-        VALUES (?, ?, CURRENT_TIMESTAMP)
-        """, (code, name))
-        self.conn.commit()
+        """
+        立即記錄一次使用（一般改用 StationFrecency 批次寫入）
+        """
+        with transaction(self.db_path) as conn:
+            conn.execute("""
+            INSERT INTO main.recent_stations (code, name, used_at, use_count, score, scored_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP, 1, 1.0, CAST(strftime('%s', 'now') AS REAL))
+            ON CONFLICT (code) DO UPDATE SET
+                name = excluded.name,
+                used_at = excluded.used_at,
+                use_count = use_count + 1
+            """, (code, name))
+
+    def save_many(self, entries: Iterable[tuple]):
+        """
+        單一交易寫入多筆
+        entries：(code, name, used_at, use_count, score, scored_at)
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        with transaction(self.db_path) as conn:
+            conn.executemany(self.UPSERT_SQL, entries)
+
+    def load_all(self) -> list[dict]:
+        rows = get_connection(self.db_path).execute("""
+        SELECT code, name, used_at, use_count, score, scored_at
+        FROM main.recent_stations
+        """).fetchall()
+        return [dict(row) for row in rows]
 
     def list_recent(self, limit=5):
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        rows = get_connection(self.db_path).execute("""
         SELECT code, name
-        FROM recent_stations
+        FROM main.recent_stations
         ORDER BY used_at DESC
         LIMIT ?
-        """, (limit,))
-        return [dict(row) for row in cursor.fetchall()]
+        """, (limit,)).fetchall()
+        return [dict(row) for row in rows]
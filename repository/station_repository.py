@@ -1,21 +1,36 @@
-import sqlite3
-from pathlib import Path
+from core.text import fold_text
+from db.database import get_readonly_connection
+
 
 class StationRepository:
-    def __init__(self):
-        db_path = Path(__file__).parent.parent / "data" / "stations.db"
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
+    """
+    車站參考資料（stations.db，唯讀）
+    - 所有 thread 共用一條 immutable / mmap 連線，不取檔案鎖
+    """
+
+    def __init__(self, db_path=None):
+        # None：STATION_DB_PATH
+        self.db_path = db_path
+
+    @property
+    def conn(self):
+        return get_readonly_connection(self.db_path)
+
+    def reopen(self):
+        """
+        stations.db 內容更新後重新開啟唯讀連線
+        """
+        get_readonly_connection(self.db_path, reopen=True)
 
     def search(self, keyword: str, limit: int = 10):
         cursor = self.conn.cursor()
-        kw = f"%{keyword}%"
+        kw = f"%{fold_text(keyword)}%"
 
         cursor.execute(
             """
             SELECT code, name
             FROM stations
-            WHERE code LIKE ? OR name LIKE ?
+            WHERE code LIKE ? OR search_key LIKE ?
             ORDER BY code
             LIMIT ?
             """,
@@ -23,3 +38,27 @@ class StationRepository:
         )
 
         return [dict(row) for row in cursor.fetchall()]
+
+    def list_all(self) -> list[dict]:
+        """
+        全部車站（依站碼），供建立記憶體索引
+        - search_key：正規化後的站名（未回填的舊資料當場計算）
+        - name_en / name_pinyin：英文站名 / 漢語拼音（可能為 None）
+        """
+        cursor = self.conn.execute(
+            """
+            SELECT code, name, search_key, name_en, name_pinyin
+            FROM stations
+            ORDER BY code
+            """
+        )
+        return [
+            {
+                "code": row["code"],
+                "name": row["name"],
+                "search_key": row["search_key"] or fold_text(row["name"]),
+                "name_en": row["name_en"],
+                "name_pinyin": row["name_pinyin"],
+            }
+            for row in cursor.fetchall()
+        ]
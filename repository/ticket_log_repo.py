@@ -1,12 +1,68 @@
 # repository/ticket_log_repo.py
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
-from db.database import get_connection  # 確認你有這個模組
+from typing import Iterable
+from db.database import get_connection, transaction
 
 class TicketLogRepository:
     """
     台鐵訂票紀錄資料存取
     """
 
+    INSERT_SQL = """
+    INSERT INTO ticket_order_log (
+        request_id, employee_id, order_time, travel_date,
+        start_station, end_station,
+        train_no, ticket_qty,
+        status, message, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    COLUMNS = """
+        id, employee_id, order_time, travel_date,
+        start_station, end_station, train_no, ticket_qty,
+        status, message, created_at, request_id
+    """
+
+    # idx_ticket_order_log_request
+    FETCH_BY_REQUEST_SQL = f"""
+    SELECT {COLUMNS}
+    FROM ticket_order_log
+    WHERE request_id = ?
+    ORDER BY id
+    """
+
+    # idx_ticket_order_log_employee_date (employee_id, travel_date, status)
+    FETCH_BY_EMPLOYEE_SQL = f"""
+    SELECT {COLUMNS}
+    FROM ticket_order_log
+    WHERE employee_id = ?
+      AND travel_date BETWEEN ? AND ?
+    ORDER BY travel_date DESC
+    LIMIT ?
+    """
+
+    # 只讀索引欄位（covering），不回表
+    STATUS_COUNTS_SQL = """
+    SELECT status, COUNT(*)
+    FROM ticket_order_log
+    WHERE employee_id = ?
+      AND travel_date BETWEEN ? AND ?
+    GROUP BY status
+    """
+
+    # idx_ticket_order_log_status (status, travel_date)
+    FETCH_BY_STATUS_SQL = f"""
+    SELECT {COLUMNS}
+    FROM ticket_order_log
+    WHERE status = ?
+    ORDER BY travel_date DESC, id DESC
+    LIMIT ?
+    """
+
     @staticmethod
     def insert(
         employee_id: str,
@@ -16,29 +72,263 @@ class TicketLogRepository:
         train_no: str,
         ticket_qty: int,
         status: str,
-        message: str = ""
+        message: str = "",
+        request_id: int | None = None,
     ):
         """
         新增一筆訂票紀錄
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        TicketLogRepository.insert_many([{
+            "request_id": request_id,
+            "employee_id": employee_id,
+            "travel_date": travel_date,
+            "start_station": start_station,
+            "end_station": end_station,
+            "train_no": train_no,
+            "ticket_qty": ticket_qty,
+            "status": status,
+            "message": message,
+        }])
 
+    @staticmethod
+    def insert_many(records: Iterable[dict]):
+        """
+        同一個交易內寫入多筆訂票紀錄
+        - record 欄位同 insert() 參數（request_id 可省略）
+        - 可帶 created_at（送出當下的時間）；未帶則以寫入時間為準
+        """
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        cursor.execute("""
-        INSERT INTO ticket_order_log (
-            employee_id, order_time, travel_date,
-            start_station, end_station,
-            train_no, ticket_qty,
-            status, message, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            employee_id, now, travel_date,
-            start_station, end_station,
-            train_no, ticket_qty,
-            status, message, now
-        ))
-
-        conn.commit()
-        conn.close()
+        params = [
+            (
+                r.get("request_id"),
+                r["employee_id"], r.get("created_at", now), r["travel_date"],
+                r["start_station"], r["end_station"],
+                r["train_no"], r["ticket_qty"],
+                r["status"], r.get("message", ""), r.get("created_at", now),
+            )
+            for r in records
+        ]
+        if not params:
+            return
+
+        with transaction() as conn:
+            conn.executemany(TicketLogRepository.INSERT_SQL, params)
+
+    # =========================
+    # Queries（報表 / UI）
+    # =========================
+    @staticmethod
+    def fetch_by_employee(
+        employee_id: str,
+        date_from: str = "",
+        date_to: str = "9999/99/99",
+        limit: int = 100,
+    ):
+        """
+        某員工在乘車日期區間內的訂票紀錄（日期格式 YYYY/MM/DD）
+        """
+        return get_connection().execute(
+            TicketLogRepository.FETCH_BY_EMPLOYEE_SQL,
+            (employee_id, date_from, date_to, limit),
+        ).fetchall()
+
+    @staticmethod
+    def status_counts(
+        employee_id: str,
+        date_from: str = "",
+        date_to: str = "9999/99/99",
+    ) -> dict[str, int]:
+        rows = get_connection().execute(
+            TicketLogRepository.STATUS_COUNTS_SQL,
+            (employee_id, date_from, date_to),
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def fetch_by_request(request_id: int):
+        """
+        某筆訂票請求的送出結果（每個車次一筆）
+        """
+        return get_connection().execute(
+            TicketLogRepository.FETCH_BY_REQUEST_SQL,
+            (request_id,),
+        ).fetchall()
+
+    @staticmethod
+    def fetch_by_status(status: str, limit: int = 100):
+        """
+        依狀態（SUCCESS / FAILED）取最近乘車日期的紀錄
+        """
+        return get_connection().execute(
+            TicketLogRepository.FETCH_BY_STATUS_SQL,
+            (status, limit),
+        ).fetchall()
+
+
+class TicketLogWriter:
+    """
+    訂票紀錄背景寫入（write-behind）
+    - write() 只把一次送出的所有紀錄放進佇列，不等待磁碟
+    - 背景 thread 合併佇列中的批次，以單一交易寫入
+    - 佇列有上限；滿了就改為同步寫入，不丟資料
+    - 合併寫入失敗時改為每次送出各自一個交易重試，一筆壞資料不會拖累其他送出
+    - close() 會先寫完佇列中剩餘的紀錄
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        max_pending: int = 256,
+        max_batch_rows: int = 500,
+        put_timeout: float = 0.2,
+        retries: int = 3,
+        retry_delay: float = 0.2,
+    ):
+        self.max_batch_rows = max_batch_rows
+        self.put_timeout = put_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def start(self):
+        with self._lock:
+            if self._thread or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="TicketLogWriter",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def flush(self):
+        """
+        等待目前佇列中的紀錄全部寫入
+        """
+        if self._thread:
+            self._queue.join()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread:
+            self._queue.put(self._STOP)
+            thread.join()
+
+    # =========================
+    # Public API
+    # =========================
+    def write(self, records: list[dict]):
+        if not records:
+            return
+
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        batch = [{"created_at": stamp, **r} for r in records]
+
+        if self._closed or not self._thread:
+            TicketLogRepository.insert_many(batch)
+            return
+
+        try:
+            self._queue.put(batch, timeout=self.put_timeout)
+        except queue.Full:
+            TicketLogRepository.insert_many(batch)
+
+    # =========================
+    # Worker
+    # =========================
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                return
+
+            batches = [item]
+            rows = len(item)
+            stop = False
+
+            # 把已在佇列中的批次一起寫入
+            while rows < self.max_batch_rows:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is self._STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batches.append(more)
+                rows += len(more)
+
+            try:
+                self._write(batches)
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+            if stop:
+                return
+
+    def _write(self, batches: list[list[dict]]):
+        try:
+            TicketLogRepository.insert_many(
+                [r for batch in batches for r in batch]
+            )
+            return
+        except Exception as e:
+            print(f"[TicketLogWriter] 合併寫入失敗，改為逐次寫入: {e}")
+
+        # 每次送出各自一個交易；失敗的再退避重試
+        for batch in batches:
+            delay = self.retry_delay
+            for attempt in range(self.retries + 1):
+                try:
+                    TicketLogRepository.insert_many(batch)
+                    break
+                except Exception as e:
+                    if attempt == self.retries:
+                        print(
+                            f"[TicketLogWriter] 無法寫入訂票紀錄"
+                            f"（{len(batch)} 筆，已放棄）: {e}"
+                        )
+                        break
+                    time.sleep(delay)
+                    delay *= 2
+
+
+_writer: TicketLogWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> TicketLogWriter:
+    """
+    取得共用的背景寫入器（第一次呼叫時啟動，程式結束時自動 flush）
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = TicketLogWriter()
+            _writer.start()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def shutdown_log_writer():
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer:
+        writer.close()
@@ -1,46 +1,93 @@
 from datetime import datetime
-from db.database import get_connection
+from db.database import get_connection, transaction
+from repository.timetable_repo import normalize_train_no
 
 
-class TicketRequestRepository:
-    TABLE_NAME = "ticket_request_log"
-
-    # =========================
-    # Table init
-    # =========================
-    @staticmethod
-    def ensure_table():
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(f"""
-        CREATE TABLE IF NOT EXISTS {TicketRequestRepository.TABLE_NAME} (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-
-            -- 員工快照（避免跨 DB JOIN）
-            employee_id TEXT NOT NULL,
-            employee_name TEXT NOT NULL,
-            employee_id_number TEXT NOT NULL,
+def _normalize_date(value: str) -> str:
+    # UI 傳 YYYY-MM-DD，訂票紀錄用 YYYY/MM/DD；child table 統一存 YYYY-MM-DD
+    return value.strip().replace("/", "-")
 
-            -- 訂票資訊
-            start_station TEXT NOT NULL,
-            end_station TEXT NOT NULL,
-            trip_type TEXT NOT NULL,
-            ticket_count INTEGER NOT NULL,
-            travel_date TEXT NOT NULL,
-            train_nos TEXT NOT NULL,
 
-            -- 排程
-            is_scheduled INTEGER NOT NULL,
-            scheduled_at TEXT,
-
-            -- 時間
-            requested_at TEXT NOT NULL
-        )
-        """)
+class TicketRequestRepository:
+    TABLE_NAME = "ticket_request_log"
 
-        conn.commit()
-        conn.close()
+    # 修改後的 SQL 查詢，確保順序與 TableModel 對齊
+    # index 0: 員工 (ID-姓名)
+    # index 1: 身分證
+    # index 2: 起站（代碼-站名）
+    # index 3: 迄站（代碼-站名）
+    # index 4: 張數
+    # index 5: 乘車日期
+    # index 6: 排程 (is_scheduled)
+    # index 7: 預計時間 (scheduled_at)
+    # index 8: 申請時間 (requested_at)
+    # index 9: id（與 requested_at 組成分頁 cursor）
+    # 依 idx_ticket_request_log_requested_at 由新到舊讀取，不需排序；
+    # 員工 / 站名由附掛的 employees、stations 資料庫以索引 JOIN 取得，
+    # 舊資料的快照欄位只在員工已不存在時備用
+    SELECT_COLUMNS = f"""
+    SELECT
+        r.employee_id || '-' || COALESCE(e.name, r.employee_name, ''),
+        COALESCE(e.id_number, r.employee_id_number, ''),
+        r.start_station || COALESCE('-' || (
+            SELECT s.name FROM stations.stations s
+            WHERE s.code = r.start_station LIMIT 1
+        ), ''),
+        r.end_station || COALESCE('-' || (
+            SELECT s.name FROM stations.stations s
+            WHERE s.code = r.end_station LIMIT 1
+        ), ''),
+        r.ticket_count,
+        r.travel_date,
+        r.is_scheduled,
+        r.scheduled_at,
+        r.requested_at,
+        r.id
+    FROM {TABLE_NAME} r
+    LEFT JOIN employees.employees e ON e.emp_id = r.employee_id
+    """
+
+    FETCH_RECENT_SQL = SELECT_COLUMNS + """
+    ORDER BY r.requested_at DESC, r.id DESC
+    LIMIT ?
+    """
+
+    # Keyset 分頁：從上一頁最後一筆 (requested_at, id) 之後接著讀
+    FETCH_PAGE_SQL = SELECT_COLUMNS + """
+    WHERE (r.requested_at, r.id) < (?, ?)
+    ORDER BY r.requested_at DESC, r.id DESC
+    LIMIT ?
+    """
+
+    # 依車次 + 乘車日期區間查詢（idx_ticket_request_train_lookup）
+    FIND_BY_TRAIN_SQL = SELECT_COLUMNS + """
+    JOIN ticket_request_train t ON t.request_id = r.id
+    WHERE t.train_no = ?
+      AND t.travel_date BETWEEN ? AND ?
+    ORDER BY t.travel_date, t.request_id
+    """
+
+    # 請求與各車次結果（view：ticket_request_history）
+    FETCH_HISTORY_SQL = """
+    SELECT
+        request_id, employee_id, start_station, end_station,
+        travel_date, requested_at, train_no, status, message, completed_at
+    FROM ticket_request_history
+    WHERE request_id = ?
+    """
+
+    # 重複請求檢查（idx_ticket_request_train_guard）
+    # PENDING：尚未有結果；SUCCESS：已訂票成功
+    FIND_DUPLICATE_SQL = """
+    SELECT t.request_id, t.train_no, t.status, r.requested_at
+    FROM ticket_request_train t
+    JOIN ticket_request_log r ON r.id = t.request_id
+    WHERE t.employee_id = ?
+      AND t.travel_date = ?
+      AND t.train_no = ?
+      AND t.status IN ('PENDING', 'SUCCESS')
+    LIMIT 1
+    """
 
     # =========================
     # Insert
@@ -49,8 +96,6 @@ class TicketRequestRepository:
     def insert(
         *,
         employee_id: str,
-        employee_name: str,
-        employee_id_number: str,
         start_station: str,
         end_station: str,
         trip_type: str,
@@ -59,89 +104,159 @@ class TicketRequestRepository:
         train_nos: list[str],
         is_scheduled: bool,
         scheduled_at: datetime | None,
-    ):
-        TicketRequestRepository.ensure_table()
-
-        clean_train_nos = [no for no in train_nos if no]
+    ) -> int:
+        """
+        新增請求紀錄，車次同時寫入 ticket_request_train，回傳 request id
+        - 車次去掉前導 0（0402 與 402 視為同一車次）
+        """
+        clean_train_nos = list(dict.fromkeys(
+            normalize_train_no(no) for no in train_nos if no and no.strip()
+        ))
         train_nos_str = ",".join(clean_train_nos)
 
         requested_at = datetime.now().isoformat()
 
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+            INSERT INTO {TicketRequestRepository.TABLE_NAME} (
+                employee_id,
+                start_station,
+                end_station,
+                trip_type,
+                ticket_count,
+                travel_date,
+                train_nos,
+                is_scheduled,
+                scheduled_at,
+                requested_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                employee_id,
+                start_station,
+                end_station,
+                trip_type,
+                ticket_count,
+                travel_date,
+                train_nos_str,
+                1 if is_scheduled else 0,
+                scheduled_at.isoformat() if scheduled_at else None,
+                requested_at,
+            ))
+            request_id = cursor.lastrowid
+
+            cursor.executemany("""
+            INSERT INTO ticket_request_train (
+                request_id, train_no, travel_date, employee_id, status
+            )
+            VALUES (?, ?, ?, ?, 'PENDING')
+            """, [
+                (request_id, no, _normalize_date(travel_date), employee_id)
+                for no in clean_train_nos
+            ])
+
+        return request_id
 
-        cursor.execute(f"""
-        INSERT INTO {TicketRequestRepository.TABLE_NAME} (
-            employee_id,
-            employee_name,
-            employee_id_number,
-            start_station,
-            end_station,
-            trip_type,
-            ticket_count,
-            travel_date,
-            train_nos,
-            is_scheduled,
-            scheduled_at,
-            requested_at
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            employee_id,
-            employee_name,
-            employee_id_number,
-            start_station,
-            end_station,
-            trip_type,
-            ticket_count,
-            travel_date,
-            train_nos_str,
-            1 if is_scheduled else 0,
-            scheduled_at.isoformat() if scheduled_at else None,
-            requested_at,
-        ))
+    @staticmethod
+    def mark_status(request_id: int, status: str):
+        """
+        將請求中仍為 PENDING 的車次改為指定狀態（例如準備階段就失敗）
+        """
+        with transaction() as conn:
+            conn.execute("""
+            UPDATE ticket_request_train
+            SET status = ?
+            WHERE request_id = ? AND status = 'PENDING'
+            """, (status, request_id))
 
-        conn.commit()
-        conn.close()
+    # =========================
+    # Duplicate guard
+    # =========================
+    @staticmethod
+    def find_active_duplicate(
+        *,
+        employee_id: str,
+        travel_date: str,
+        train_nos: list[str],
+    ):
+        """
+        同一員工、同一乘車日期、同一車次是否已有處理中或成功的請求
+        - 車次比對方式同 insert（去掉前導 0）
+        - 有：回傳 (request_id, train_no, status, requested_at)
+        - 無：None
+        """
+        conn = get_connection()
+        date = _normalize_date(travel_date)
+
+        for no in train_nos:
+            if not no or not no.strip():
+                continue
+            row = conn.execute(
+                TicketRequestRepository.FIND_DUPLICATE_SQL,
+                (employee_id, date, normalize_train_no(no)),
+            ).fetchone()
+            if row:
+                return row
+        return None
 
     # =========================
     # Fetch (for UI)
     # =========================
     @staticmethod
     def fetch_all(limit: int = 100):
-        TicketRequestRepository.ensure_table()
         conn = get_connection()
         cursor = conn.cursor()
+        cursor.execute(TicketRequestRepository.FETCH_RECENT_SQL, (limit,))
 
-        # 修改後的 SQL 查詢，確保順序與 TableModel 對齊
-        # index 0: 員工 (ID-姓名)
-        # index 1: 身分證
-        # index 2: 起站
-        # index 3: 迄站
-        # index 4: 張數
-        # index 5: 乘車日期
-        # index 6: 排程 (is_scheduled)
-        # index 7: 預計時間 (scheduled_at)
-        # index 8: 申請時間 (requested_at)
-        cursor.execute(f"""
-        SELECT
-            employee_id || '-' || employee_name,
-            employee_id_number,
-            start_station,
-            end_station,
-            ticket_count,
-            travel_date,
-            is_scheduled,
-            scheduled_at,
-            requested_at
-        FROM {TicketRequestRepository.TABLE_NAME}
-        ORDER BY requested_at DESC
-        LIMIT ?
-        """, (limit,))
-
-        rows = cursor.fetchall()
-        conn.close()
-        return rows
+        return cursor.fetchall()
+
+    @staticmethod
+    def fetch_page(limit: int = 100, before: tuple[str, int] | None = None):
+        """
+        由新到舊分頁讀取
+        - before：上一頁最後一筆的 (requested_at, id)；None 表示第一頁
+        """
+        if before is None:
+            return TicketRequestRepository.fetch_all(limit)
+
+        requested_at, row_id = before
+        return get_connection().execute(
+            TicketRequestRepository.FETCH_PAGE_SQL,
+            (requested_at, row_id, limit),
+        ).fetchall()
+
+    @staticmethod
+    def page_cursor(row) -> tuple[str, int]:
+        return row[8], row[9]
+
+    @staticmethod
+    def fetch_history(request_id: int):
+        """
+        某筆請求與其送出結果（尚未送出時結果欄位為 None）
+        """
+        return get_connection().execute(
+            TicketRequestRepository.FETCH_HISTORY_SQL,
+            (request_id,),
+        ).fetchall()
+
+    @staticmethod
+    def find_by_train(
+        train_no: str,
+        date_from: str,
+        date_to: str | None = None,
+    ):
+        """
+        誰申請了某車次（乘車日期區間，接受 YYYY-MM-DD 或 YYYY/MM/DD）
+        """
+        date_from = _normalize_date(date_from)
+        date_to = _normalize_date(date_to) if date_to else date_from
+
+        return get_connection().execute(
+            TicketRequestRepository.FIND_BY_TRAIN_SQL,
+            (normalize_train_no(train_no), date_from, date_to),
+        ).fetchall()
     
 # from datetime import datetime
 # from db.database import get_connection
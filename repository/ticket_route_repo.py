@@ -0,0 +1,56 @@
+from db.database import get_connection, transaction
+
+
+class TicketRouteRepository:
+    """
+    常用路線（ticket_route_stats）
+    - 由 ticket_request_log 的 trigger 逐筆累加
+    - 依起站查最常用的迄站走索引，不需要 GROUP BY 整張紀錄表
+    """
+
+    REBUILD_SQL = """
+    INSERT INTO ticket_route_stats (
+        start_station, end_station, requests, last_used
+    )
+    SELECT start_station, end_station, COUNT(*), MAX(requested_at)
+    FROM ticket_request_log
+    GROUP BY start_station, end_station
+    """
+
+    # idx_ticket_route_stats_popular
+    TOP_DESTINATIONS_SQL = """
+    SELECT end_station, requests, last_used
+    FROM ticket_route_stats
+    WHERE start_station = ?
+    ORDER BY requests DESC, last_used DESC
+    LIMIT ?
+    """
+
+    # =========================
+    # Maintenance
+    # =========================
+    @staticmethod
+    def rebuild(conn=None):
+        """
+        由 ticket_request_log 重新計算（既有資料 / 修正用）
+        """
+        if conn is not None:
+            conn.execute("DELETE FROM ticket_route_stats")
+            conn.execute(TicketRouteRepository.REBUILD_SQL)
+            return
+
+        with transaction() as conn:
+            TicketRouteRepository.rebuild(conn)
+
+    # =========================
+    # Queries
+    # =========================
+    @staticmethod
+    def top_destinations(start_station: str, limit: int = 5):
+        """
+        某起站最常用的迄站 (end_station, requests, last_used)
+        """
+        return get_connection().execute(
+            TicketRouteRepository.TOP_DESTINATIONS_SQL,
+            (start_station, limit),
+        ).fetchall()
@@ -0,0 +1,100 @@
+from datetime import date
+
+from db.database import get_connection, transaction
+
+
+class TicketStatsRepository:
+    """
+    每日訂票統計（ticket_daily_stats）
+    - 由 ticket_request_log / ticket_order_log 的 trigger 逐筆累加
+    - 查詢只讀統計表，不需要 GROUP BY 整張紀錄表
+    """
+
+    REBUILD_SQL = """
+    INSERT INTO ticket_daily_stats (
+        employee_id, day, requests, successes, failures
+    )
+    SELECT employee_id, day, SUM(requests), SUM(successes), SUM(failures)
+    FROM (
+        SELECT employee_id, date(requested_at) AS day,
+               1 AS requests, 0 AS successes, 0 AS failures
+        FROM ticket_request_log
+
+        UNION ALL
+
+        SELECT employee_id,
+               COALESCE(date(created_at), date(order_time)) AS day,
+               0, status = 'SUCCESS', status = 'FAILED'
+        FROM ticket_order_log
+        WHERE employee_id IS NOT NULL
+    )
+    WHERE day IS NOT NULL
+    GROUP BY employee_id, day
+    """
+
+    # idx_ticket_daily_stats_day
+    TOTALS_BY_DAY_SQL = """
+    SELECT
+        COALESCE(SUM(requests), 0),
+        COALESCE(SUM(successes), 0),
+        COALESCE(SUM(failures), 0)
+    FROM ticket_daily_stats
+    WHERE day BETWEEN ? AND ?
+    """
+
+    # PRIMARY KEY (employee_id, day)
+    DAILY_BY_EMPLOYEE_SQL = """
+    SELECT day, requests, successes, failures
+    FROM ticket_daily_stats
+    WHERE employee_id = ?
+      AND day BETWEEN ? AND ?
+    ORDER BY day
+    """
+
+    # =========================
+    # Maintenance
+    # =========================
+    @staticmethod
+    def rebuild(conn=None):
+        """
+        由紀錄表重新計算整張統計表（既有資料 / 修正用）
+        """
+        if conn is not None:
+            conn.execute("DELETE FROM ticket_daily_stats")
+            conn.execute(TicketStatsRepository.REBUILD_SQL)
+            return
+
+        with transaction() as conn:
+            TicketStatsRepository.rebuild(conn)
+
+    # =========================
+    # Queries
+    # =========================
+    @staticmethod
+    def totals(day_from: str | None = None, day_to: str | None = None) -> dict:
+        """
+        日期區間（YYYY-MM-DD，預設今天）內所有員工的合計
+        """
+        day_from = day_from or date.today().isoformat()
+        day_to = day_to or day_from
+
+        requests, successes, failures = get_connection().execute(
+            TicketStatsRepository.TOTALS_BY_DAY_SQL,
+            (day_from, day_to),
+        ).fetchone()
+
+        return {
+            "requests": requests,
+            "successes": successes,
+            "failures": failures,
+        }
+
+    @staticmethod
+    def daily(employee_id: str, day_from: str, day_to: str):
+        """
+        某員工每日的請求 / 成功 / 失敗數
+        """
+        return get_connection().execute(
+            TicketStatsRepository.DAILY_BY_EMPLOYEE_SQL,
+            (employee_id, day_from, day_to),
+        ).fetchall()
@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import Iterable
+
+from db.database import get_connection, transaction
+
+
+def normalize_train_no(train_no: str) -> str:
+    # 使用者常輸入 0123；時刻表為 123
+    return train_no.strip().lstrip("0") or "0"
+
+
+class TimetableRepository:
+    """
+    離線台鐵時刻表（timetable_stop / timetable_date）
+    - 以日期為單位整批取代
+    - 查某日某車次只走主鍵前綴 (train_date, train_no)
+    """
+
+    INSERT_STOP_SQL = """
+    INSERT INTO timetable_stop (
+        train_date, train_no, stop_seq, station_code,
+        arrival_time, departure_time
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    # PRIMARY KEY (train_date, train_no, stop_seq)
+    TRAIN_STOPS_SQL = """
+    SELECT
+        COUNT(*),
+        MIN(CASE WHEN station_code = ? THEN stop_seq END),
+        MAX(CASE WHEN station_code = ? THEN stop_seq END)
+    FROM timetable_stop
+    WHERE train_date = ? AND train_no = ?
+    """
+
+    HAS_DATE_SQL = """
+    SELECT 1 FROM timetable_date WHERE train_date = ?
+    """
+
+    # =========================
+    # Import
+    # =========================
+    @staticmethod
+    def replace_date(
+        train_date: str,
+        trains: Iterable[tuple[str, list[tuple]]],
+        source: str | None = None,
+    ) -> int:
+        """
+        以新資料取代某日的時刻表
+        - trains：(train_no, [(stop_seq, station_code, arrival, departure)])
+        - 回傳車次數
+        """
+        count = 0
+        rows = []
+        for train_no, stops in trains:
+            count += 1
+            no = normalize_train_no(train_no)
+            rows.extend(
+                (train_date, no, seq, code, arrival, departure)
+                for seq, code, arrival, departure in stops
+            )
+
+        with transaction() as conn:
+            conn.execute(
+                "DELETE FROM timetable_stop WHERE train_date = ?", (train_date,)
+            )
+            conn.executemany(TimetableRepository.INSERT_STOP_SQL, rows)
+            conn.execute(
+                """
+                INSERT INTO timetable_date (train_date, trains, source, imported_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (train_date) DO UPDATE SET
+                    trains = excluded.trains,
+                    source = excluded.source,
+                    imported_at = excluded.imported_at
+                """,
+                (train_date, count, source, datetime.now().isoformat()),
+            )
+        return count
+
+    # =========================
+    # Queries
+    # =========================
+    @staticmethod
+    def has_date(train_date: str) -> bool:
+        return get_connection().execute(
+            TimetableRepository.HAS_DATE_SQL, (train_date,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def check_train(
+        train_date: str,
+        train_no: str,
+        from_station: str,
+        to_station: str,
+    ) -> str | None:
+        """
+        檢查車次是否存在、是否依序停靠起訖站
+        - 正常：None
+        - 有問題：錯誤原因
+        """
+        stops, from_seq, to_seq = get_connection().execute(
+            TimetableRepository.TRAIN_STOPS_SQL,
+            (from_station, to_station, train_date, normalize_train_no(train_no)),
+        ).fetchone()
+
+        if not stops:
+            return f"車次 {train_no} 於 {train_date} 不存在"
+        if from_seq is None:
+            return f"車次 {train_no} 不停靠起站 {from_station}"
+        if to_seq is None:
+            return f"車次 {train_no} 不停靠迄站 {to_station}"
+        if from_seq >= to_seq:
+            return f"車次 {train_no} 行駛方向不是 {from_station} → {to_station}"
+        return None
+
+    @staticmethod
+    def validate_trains(
+        train_date: str,
+        from_station: str,
+        to_station: str,
+        train_nos: list[str],
+    ) -> list[str]:
+        """
+        回傳所有有問題車次的原因；該日尚未匯入時刻表時不檢查（回傳空 list）
+        """
+        train_date = train_date.strip().replace("/", "-")
+        if not TimetableRepository.has_date(train_date):
+            return []
+
+        problems = []
+        for train_no in train_nos:
+            problem = TimetableRepository.check_train(
+                train_date, train_no, from_station, to_station
+            )
+            if problem:
+                problems.append(problem)
+        return problems
@@ -0,0 +1,81 @@
+"""
+Employee 建構成本 / 記憶體 micro-benchmark（100k 筆）
+
+    python -m scripts.bench_employee
+
+- legacy：原本的 frozen dataclass（無 __slots__、每次 re.match 驗證）
+- validated：Employee(...)（slots + 預先編譯的 regex）
+- hydrate：Employee.hydrate(...)（repository 讀回時使用，不驗證）
+"""
+from __future__ import annotations
+
+import re
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from domain.employee import Employee
+
+N = 100_000
+
+
+@dataclass(frozen=True)
+class LegacyEmployee:
+    emp_id: str
+    name: str
+    id_number: str
+    department: str
+    is_active: bool = True
+    hired_date: Optional[date] = None
+
+    def __post_init__(self):
+        if not self.emp_id or len(self.emp_id) > 20:
+            raise ValueError("emp_id")
+        if not self.name or len(self.name) > 50:
+            raise ValueError("name")
+        if not re.match(r"^[A-Z][12]\d{8}$", self.id_number):
+            raise ValueError("id_number")
+        if not self.department or len(self.department) > 50:
+            raise ValueError("department")
+
+
+def _rows():
+    hired = date(2020, 1, 1)
+    # 字串先建好，只量測 instance 本身
+    return [
+        (f"E{i:06d}", f"員工{i}", "A123456789", "資訊部", True, hired)
+        for i in range(N)
+    ]
+
+
+def _measure(label: str, build, rows):
+    start = time.perf_counter()
+    objs = [build(*r) for r in rows]
+    elapsed = time.perf_counter() - start
+    del objs
+
+    tracemalloc.start()
+    objs = [build(*r) for r in rows]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+
+    print(
+        f"{label:<10} {elapsed * 1000:8.1f} ms"
+        f"  {elapsed / N * 1e9:7.0f} ns/筆"
+        f"  {size / N:6.0f} bytes/筆"
+    )
+
+
+def main():
+    rows = _rows()
+    print(f"{N} 筆 Employee")
+    _measure("legacy", LegacyEmployee, rows)
+    _measure("validated", Employee, rows)
+    _measure("hydrate", Employee.hydrate, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+車站搜尋 benchmark：SQLite LIKE '%kw%' vs 記憶體索引
+
+    python -m scripts.bench_station_search
+
+- 在暫存目錄複製一份 stations.db 並升級到最新 schema，不改動 data/stations.db
+"""
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from db import database
+from db.migrations import migrate
+from repository.station_repository import StationRepository
+from services import station_dataset
+from services.station_index import StationIndex
+
+QUERIES = ["1", "10", "1000", "臺", "臺中", "北", "新竹", "00", "xyz"]
+ROUNDS = 2000
+
+
+def _per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for q in QUERIES:
+            fn(q)
+    return (time.perf_counter() - start) / (ROUNDS * len(QUERIES)) * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "stations.db"
+        shutil.copy(database.STATION_DB_PATH, db_path)
+        try:
+            migrate("stations", db_path)
+            station_dataset.apply_dataset(db_path)
+            run(StationRepository(db_path))
+        finally:
+            database.close_all_connections()
+
+
+def run(repo: StationRepository):
+    start = time.perf_counter()
+    index = StationIndex(repo.list_all())
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(index)} 站，建立索引 {build_ms:.2f} ms")
+    print(f"SQLite LIKE   {_per_call_us(repo.search):8.1f} us/查詢")
+    print(f"StationIndex  {_per_call_us(index.search):8.1f} us/查詢")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+匯入台鐵時刻表（TDX / PTX 開放資料 JSON）
+
+    python -m scripts.import_timetable <timetable.json> [--date YYYY-MM-DD]
+
+- 同一日期重複匯入時以新檔整批取代
+- 定期時刻表（沒有 TrainDate）需以 --date 指定套用日期
+"""
+import sys
+
+from db.migrations import migrate
+from services.timetable_import import import_file
+
+
+def main():
+    args = sys.argv[1:]
+    train_date = None
+    if "--date" in args:
+        i = args.index("--date")
+        train_date = args[i + 1]
+        del args[i:i + 2]
+
+    if len(args) != 1:
+        print(__doc__)
+        sys.exit(1)
+
+    migrate("ticket")
+    for date, trains in sorted(import_file(args[0], train_date).items()):
+        print(f"{date}：{trains} 個車次")
+
+
+if __name__ == "__main__":
+    main()
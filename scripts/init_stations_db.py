@@ -1,94 +1,32 @@
-import sqlite3
-from pathlib import Path
+"""
+初始化 / 更新 stations.db
 
-db_path = Path(__file__).parent.parent / "data" / "stations.db"
-db_path.parent.mkdir(exist_ok=True)
+    python -m scripts.init_stations_db [--force]
 
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
+- 站點資料在 data/stations.json（含 version），英文 / 拼音在 data/station_names.json
+- 依站碼 upsert，可重複執行；資料集未變更時不寫入
+- 同時重新產生 data/stations.snapshot.json（程式啟動時直接載入）
+"""
+import sys
 
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS stations (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    code TEXT NOT NULL,
-    name TEXT NOT NULL
-);
-""")
+from db.migrations import migrate
+from services import station_dataset
 
-stations = [
-    # 基隆/台北地區
-    ("0900", "基隆"), ("0910", "三坑"), ("0920", "八堵"), ("0930", "七堵"), ("0940", "百福"), ("0950", "五堵"), ("0960", "汐止"), ("0970", "汐科"), 
-    ("0980", "南港"), ("0990", "松山"), ("1000", "臺北"), ("1010", "萬華"), ("1020", "板橋"), ("1030", "浮洲"), ("1040", "樹林"), ("1050", "南樹林"), 
-    ("1060", "山佳"), ("1070", "鶯歌"), 
-    
-    # 桃園/新竹地區
-    ("1080", "桃園"), ("1090", "內壢"), ("1100", "中壢"), ("1110", "埔心"), ("1120", "楊梅"), ("1130", "富岡"), ("1140", "新富"), ("1150", "北湖"), 
-    ("1160", "湖口"), ("1170", "新豐"), ("1180", "竹北"), ("1190", "北新竹"), ("1210", "新竹"), ("1220", "香山"), 
-    
-    # 苗栗地區
-    ("1230", "崎頂"), ("1240", "竹南"), ("1250", "談文"), ("1260", "大山"), ("1270", "後龍"), ("1280", "龍港"), ("1290", "白沙屯"), ("1300", "新埔"), 
-    ("1310", "通霄"), ("1320", "苑裡"), ("1330", "造橋"), ("1340", "豐富"), ("1350", "苗栗"), ("1370", "南勢"), ("1380", "銅鑼"), ("1390", "三義"), 
-    
-    # 台中/彰化地區
-    ("1400", "日南"), ("1410", "大甲"), ("1420", "臺中港"), ("1430", "清水"), ("1440", "沙鹿"), ("1450", "龍井"), ("1460", "大肚"), ("1470", "追分"), 
-    ("1480", "泰安"), ("1490", "后里"), ("1500", "豐原"), ("1510", "栗林"), ("1520", "潭子"), ("1530", "頭家厝"), ("1540", "松竹"), ("1550", "太原"), 
-    ("1560", "精武"), ("1570", "臺中"), ("1580", "五權"), ("1590", "大慶"), ("1600", "烏日"), ("1610", "新烏日"), ("1620", "成功"), ("1630", "彰化"), 
-    ("1640", "花壇"), ("1650", "大村"), ("1660", "員林"), ("1670", "永靖"), ("1680", "社頭"), ("1690", "田中"), ("1700", "二水"), 
-    
-    # 雲林/嘉義地區
-    ("1710", "林內"), ("1720", "石榴"), ("1730", "斗六"), ("1740", "斗南"), ("1750", "石龜"), ("1760", "大林"), ("1770", "民雄"), ("1780", "嘉北"), 
-    ("1790", "嘉義"), ("1800", "水上"), ("1810", "南靖"), 
-    
-    # 台南地區
-    ("1820", "後壁"), ("1830", "新營"), ("1840", "柳營"), ("1850", "林鳳營"), ("1860", "隆田"), ("1870", "拔林"), ("1880", "善化"), ("1890", "南科"), 
-    ("1900", "新市"), ("1910", "永康"), ("1920", "大橋"), ("1930", "臺南"), ("1940", "保安"), ("1950", "仁德"), ("1960", "中洲"), 
-    
-    # 高雄地區
-    ("1970", "大湖"), ("1980", "路竹"), ("1990", "岡山"), ("2000", "橋頭"), ("2010", "楠梓"), ("2020", "新左營"), ("2030", "左營"), ("2040", "內惟"), 
-    ("2050", "美術館"), ("2060", "鼓山"), ("2070", "三塊厝"), ("2080", "高雄"), ("2090", "民族"), ("2100", "科工館"), ("2110", "正義"), ("2120", "鳳山"), 
-    ("2130", "後庄"), ("2140", "九曲堂"), 
-    
-    # 屏東地區
-    ("2150", "六塊厝"), ("2160", "屏東"), ("2170", "歸來"), ("2180", "麟洛"), ("2190", "西勢"), ("2200", "竹田"), ("2210", "潮州"), ("2220", "崁頂"), 
-    ("2230", "南州"), ("2240", "鎮安"), ("2250", "林邊"), ("2260", "佳冬"), ("2270", "東海"), ("2280", "枋寮"), ("2290", "加祿"), ("2300", "內獅"), 
-    ("2310", "枋山"), 
-    
-    # 台東地區
-    ("2320", "大武"), ("2330", "瀧溪"), ("2340", "金崙"), ("2350", "太麻里"), ("2360", "知本"), ("2370", "康樂"), ("2380", "臺東"), ("2390", "山里"), 
-    ("2400", "鹿野"), ("2410", "瑞源"), ("2420", "瑞和"), ("2430", "關山"), ("2440", "海端"), ("2450", "池上"), 
-    
-    # 花蓮地區
-    ("2460", "富里"), ("2470", "東竹"), ("2480", "東里"), ("2490", "玉里"), ("2500", "三民"), ("2510", "瑞穗"), ("2520", "富源"), ("2530", "大富"), 
-    ("2540", "光復"), ("2550", "萬榮"), ("2560", "鳳林"), ("2570", "南平"), ("2580", "林榮新光"), ("2590", "豐田"), ("2600", "壽豐"), ("2610", "平和"), 
-    ("2620", "志學"), ("2630", "吉安"), ("2640", "花蓮"), ("2650", "北埔"), ("2660", "景美"), ("2670", "新城"), ("2680", "崇德"), ("2690", "和仁"), 
-    ("2700", "和平"), 
-    
-    # 宜蘭地區
-    ("2710", "漢本"), ("2720", "武塔"), ("2730", "南澳"), ("2740", "東澳"), ("2750", "永樂"), ("2760", "蘇澳新"), ("2770", "蘇澳"), ("2780", "馬賽"), 
-    ("2790", "冬山"), ("2800", "羅東"), ("2810", "中里"), ("2820", "二結"), ("2830", "宜蘭"), ("2840", "四城"), ("2850", "礁溪"), ("2860", "頂埔"), 
-    ("2870", "頭城"), ("2880", "外澳"), ("2890", "龜山"), ("2900", "大溪"), ("2910", "大里"), ("2920", "石城"), 
-    
-    # 平溪/深澳線
-    ("3040", "瑞芳"), ("3050", "猴硐"), ("3060", "三貂嶺"), ("3070", "大華"), ("3080", "十分"), ("3090", "望古"), ("3100", "嶺腳"), ("3110", "平溪"), 
-    ("3120", "菁桐"), ("3130", "海科館"), ("3140", "八斗子"), 
-    
-    # 內灣/六家線
-    ("3240", "竹中"), ("3250", "六家"), ("3260", "上員"), ("3270", "榮華"), ("3280", "竹東"), ("3290", "橫山"), ("3300", "九讚頭"), ("3310", "合興"), 
-    ("3320", "富貴"), ("3330", "內灣"), ("3340", "千甲"), ("3350", "新莊"), 
-    
-    # 集集線
-    ("3420", "源泉"), ("3430", "濁水"), ("3432", "龍泉"), ("3434", "集集"), ("3435", "水里"), ("3436", "車埕"), 
-    
-    # 沙崙線
-    ("3450", "長榮大學"), ("3470", "沙崙")
-]
 
-cursor.executemany(
-    "INSERT INTO stations (code, name) VALUES (?, ?)",
-    stations
-)
+def main():
+    force = "--force" in sys.argv[1:]
 
-conn.commit()
-conn.close()
+    migrate("stations")
+    version, stations = station_dataset.load_dataset()
 
-print("stations.db 初始化完成")
+    if station_dataset.apply_dataset(force=force):
+        print(f"stations.db 已更新：資料集 v{version}，{len(stations)} 站")
+    else:
+        print(f"stations.db 已是資料集 v{version}，略過")
+
+    path = station_dataset.write_snapshot()
+    print(f"快照已寫入 {path}")
+
+
+if __name__ == "__main__":
+    main()
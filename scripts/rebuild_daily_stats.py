@@ -0,0 +1,12 @@
+from db.database import init_db
+from repository.ticket_stats_repo import TicketStatsRepository
+
+
+def main():
+    init_db()
+    TicketStatsRepository.rebuild()
+    print("ticket_daily_stats 重建完成")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+員工資料檔案格式（CSV / JSON Lines）
+- 讀取：逐列產生 (行號, dict)，不一次載入整個檔案
+- 寫入：逐筆寫出 Employee
+"""
+import csv
+import json
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from domain.employee import Employee
+
+FIELDS = ["emp_id", "name", "id_number", "department", "is_active", "hired_date"]
+
+_TRUE = {"1", "true", "yes", "y", "在職", "啟用"}
+_FALSE = {"0", "false", "no", "n", "停用"}
+
+
+def _format(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"不支援的檔案格式：{path.suffix}（請使用 .csv 或 .jsonl）")
+
+
+# =========================
+# Read
+# =========================
+def read_records(path: str | Path) -> Iterator[tuple[int, dict | None]]:
+    """
+    逐列讀取；無法解析的列（JSON 格式錯誤、CSV 欄位過長等）回傳 (行號, None)
+    """
+    path = Path(path)
+    fmt = _format(path)
+
+    # utf-8-sig：Excel 另存的 CSV 會帶 BOM
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            rows = iter(reader)
+            while True:
+                try:
+                    record = next(rows)
+                except StopIteration:
+                    return
+                except csv.Error:
+                    # 出錯的那一列尚未計入 line_num
+                    yield reader.line_num + 1, None
+                    continue
+                yield reader.line_num, record
+
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield line_no, record if isinstance(record, dict) else None
+
+
+def _text(record: dict, key: str) -> str:
+    value = record.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _parse_active(value) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"is_active 無法辨識：{value}")
+
+
+def to_employee(record: dict) -> Employee:
+    """
+    dict → Employee（驗證失敗拋 ValueError）
+    """
+    hired = _text(record, "hired_date")
+    return Employee(
+        emp_id=_text(record, "emp_id"),
+        name=_text(record, "name"),
+        id_number=_text(record, "id_number").upper(),
+        department=_text(record, "department"),
+        is_active=_parse_active(record.get("is_active")),
+        hired_date=date.fromisoformat(hired.replace("/", "-")) if hired else None,
+    )
+
+
+# =========================
+# Write
+# =========================
+def _to_record(emp: Employee) -> dict:
+    return {
+        "emp_id": emp.emp_id,
+        "name": emp.name,
+        "id_number": emp.id_number,
+        "department": emp.department,
+        "is_active": 1 if emp.is_active else 0,
+        "hired_date": emp.hired_date.isoformat() if emp.hired_date else "",
+    }
+
+
+def write_records(path: str | Path, employees: Iterable[Employee]) -> int:
+    """
+    逐筆寫出，回傳筆數
+    """
+    path = Path(path)
+    fmt = _format(path)
+    count = 0
+
+    with open(path, "w", encoding="utf-8-sig" if fmt == "csv" else "utf-8",
+              newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for emp in employees:
+                writer.writerow(_to_record(emp))
+                count += 1
+        else:
+            for emp in employees:
+                f.write(json.dumps(_to_record(emp), ensure_ascii=False) + "\n")
+                count += 1
+
+    return count
@@ -1,6 +1,31 @@
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
 from domain.employee import Employee
 from repository.employee_repository import EmployeeRepository
 from core.exceptions import NotFoundError, ValidationError
+from services import employee_io
+
+
+@dataclass
+class ImportResult:
+    """
+    批次匯入結果
+    - errors：(行號, 原因)，最多保留 MAX_ERRORS 筆；failed 為實際失敗總數
+    """
+
+    MAX_ERRORS = 200
+
+    imported: int = 0
+    failed: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def add_error(self, line_no: int, reason: str):
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append((line_no, reason))
 
 
 class EmployeeService:
@@ -11,9 +36,6 @@ class EmployeeService:
         if not emp_id or not name or not id_number:
             raise ValidationError("emp_id, name, id_number are required")
 
-        if self.repo.exists(emp_id):
-            raise ValidationError(f"Employee {emp_id} already exists")
-
         employee = Employee(
             emp_id=emp_id,
             name=name,
@@ -21,7 +43,11 @@ class EmployeeService:
             department=department,
         )
 
-        self.repo.add(employee)
+        # 主鍵衝突由 repository 回報，不再先查 exists()
+        try:
+            self.repo.add(employee)
+        except ValueError as e:
+            raise ValidationError(f"Employee {emp_id} already exists") from e
         return employee
 
     def get_employee(self, emp_id: str) -> Employee:
@@ -30,9 +56,113 @@ class EmployeeService:
             raise NotFoundError(f"Employee {emp_id} not found")
         return employee
 
+    def reload_employees(self) -> None:
+        self.repo.invalidate_cache()
+
     def list_employees(self, active_only: bool = False) -> list[Employee]:
-        employees = self.repo.list_all()
-        return [e for e in employees if e.is_active] if active_only else employees
+        if active_only:
+            return self.repo.query(active_only=True, limit=None)
+        return self.repo.list_all()
+
+    def find_employees(
+        self,
+        *,
+        active_only: bool = False,
+        department: str | None = None,
+        name_prefix: str | None = None,
+        after: str | tuple[str, str] | None = None,
+        limit: int = 100,
+    ) -> list[Employee]:
+        """
+        篩選 + 分頁；下一頁以 repo.page_key(本頁最後一筆) 作為 after
+        """
+        return self.repo.query(
+            active_only=active_only,
+            department=department or None,
+            name_prefix=name_prefix or None,
+            after=after,
+            limit=limit,
+        )
+
+    def search_employees(
+        self,
+        text: str,
+        *,
+        active_only: bool = False,
+        limit: int = 50,
+    ) -> list[Employee]:
+        """
+        依 emp_id / 姓名 / 部門搜尋（包含比對），最相關的在前
+        """
+        return self.repo.search(text, active_only=active_only, limit=limit)
+
+    # =========================
+    # Bulk import / export
+    # =========================
+    def import_employees(
+        self,
+        records: Iterable[tuple[int, dict | None]],
+        chunk_size: int = 1000,
+    ) -> ImportResult:
+        """
+        逐列驗證、每 chunk_size 筆一個交易寫入
+        - 單列錯誤（格式、重複、已存在）只記錄，不中斷整批
+        """
+        result = ImportResult()
+        seen: set[str] = set()
+        chunk: list[Employee] = []
+        lines: dict[str, int] = {}
+
+        def flush():
+            skipped = self.repo.add_many(chunk)
+            for emp_id in skipped:
+                result.add_error(lines[emp_id], f"員工 {emp_id} 已存在")
+            result.imported += len(chunk) - len(skipped)
+            chunk.clear()
+            lines.clear()
+
+        for line_no, record in records:
+            if record is None:
+                result.add_error(line_no, "無法解析")
+                continue
+
+            try:
+                employee = employee_io.to_employee(record)
+            except ValueError as e:
+                result.add_error(line_no, str(e))
+                continue
+
+            if employee.emp_id in seen:
+                result.add_error(line_no, f"員工 {employee.emp_id} 在檔案中重複")
+                continue
+            seen.add(employee.emp_id)
+
+            chunk.append(employee)
+            lines[employee.emp_id] = line_no
+            if len(chunk) >= chunk_size:
+                flush()
+
+        if chunk:
+            flush()
+        return result
+
+    def import_file(self, path: str | Path) -> ImportResult:
+        """
+        匯入 CSV / JSON Lines（欄位見 services.employee_io.FIELDS）
+        """
+        try:
+            return self.import_employees(employee_io.read_records(path))
+        except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+            raise ValidationError(f"無法讀取 {path}: {e}") from e
+
+    def export_file(self, path: str | Path) -> int:
+        """
+        匯出全部員工（依 emp_id），回傳筆數
+        """
+        try:
+            return employee_io.write_records(path, self.repo.iter_all())
+        except (OSError, ValueError) as e:
+            raise ValidationError(f"無法寫入 {path}: {e}") from e
 
     def update_employee_info(
         self,
@@ -49,6 +179,7 @@ class EmployeeService:
             id_number=id_number,
             department=department,
             is_active=employee.is_active,
+            hired_date=employee.hired_date,
         )
 
         self.repo.update(updated)
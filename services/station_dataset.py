@@ -0,0 +1,178 @@
+"""
+車站資料集
+- 來源：data/stations.json（站碼 / 站名，含 version）＋ data/station_names.json（英文 / 拼音）
+- apply_dataset()：依站碼 upsert 進 stations.db，並記錄資料集版本；重跑不會重複
+  由 scripts.init_stations_db 執行（資料集更新時），一般啟動不開 stations.db 寫入
+- 快照：data/stations.snapshot.json，啟動時不開 SQLite 直接建立搜尋索引
+  來源檔案內容或快照格式改變時視為過期，不予採用
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from core.text import fold_text
+from db import database
+
+# 快照欄位或 fold_text 規則改變時遞增
+SNAPSHOT_FORMAT = 1
+
+
+def dataset_path() -> Path:
+    return database.DATA_DIR / "stations.json"
+
+
+def names_path() -> Path:
+    return database.DATA_DIR / "station_names.json"
+
+
+def snapshot_path() -> Path:
+    return database.DATA_DIR / "stations.snapshot.json"
+
+
+# =========================
+# Dataset
+# =========================
+def source_checksum() -> str:
+    """
+    來源檔案內容的 sha256（快照與資料庫都以此判斷是否需要更新）
+    - 不解析 JSON（啟動時每次都會算）；去掉 BOM、換行統一為 LF，
+      checkout 改寫換行（core.autocrlf）不會讓快照失效
+    """
+    digest = hashlib.sha256()
+    for path in (dataset_path(), names_path()):
+        if path.exists():
+            data = path.read_bytes().removeprefix(b"\xef\xbb\xbf")
+            digest.update(data.replace(b"\r\n", b"\n"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_dataset() -> tuple[int, list[dict]]:
+    """
+    回傳 (version, [{"code", "name", "search_key", "name_en", "name_pinyin"}])
+    """
+    with open(dataset_path(), encoding="utf-8-sig") as f:
+        doc = json.load(f)
+
+    names = {}
+    if names_path().exists():
+        with open(names_path(), encoding="utf-8-sig") as f:
+            names = json.load(f)["stations"]
+
+    stations = []
+    seen = set()
+    for st in doc["stations"]:
+        code = st["code"].strip()
+        if code in seen:
+            raise ValueError(f"stations.json 站碼重複：{code}")
+        seen.add(code)
+
+        name = st["name"].strip()
+        extra = names.get(code, {})
+        stations.append({
+            "code": code,
+            "name": name,
+            "search_key": fold_text(name),
+            "name_en": extra.get("en"),
+            "name_pinyin": extra.get("pinyin"),
+        })
+
+    return int(doc["version"]), stations
+
+
+# =========================
+# Database
+# =========================
+UPSERT_SQL = """
+INSERT INTO stations (code, name, search_key, name_en, name_pinyin)
+VALUES (:code, :name, :search_key, :name_en, :name_pinyin)
+ON CONFLICT (code) DO UPDATE SET
+    name = excluded.name,
+    search_key = excluded.search_key,
+    name_en = excluded.name_en,
+    name_pinyin = excluded.name_pinyin
+"""
+
+
+def loaded_checksum(db_path=None) -> str | None:
+    row = database.get_connection(db_path or database.STATION_DB_PATH).execute(
+        "SELECT value FROM dataset_meta WHERE key = 'checksum'"
+    ).fetchone()
+    return row[0] if row else None
+
+
+def apply_dataset(db_path=None, force: bool = False) -> bool:
+    """
+    將資料集 upsert 進 stations.db（已是同一份資料時直接略過）
+    - 資料集中沒有的站不刪除（舊紀錄仍可能引用）
+    - 回傳是否有寫入
+    """
+    db_path = db_path or database.STATION_DB_PATH
+    checksum = source_checksum()
+    if not force and loaded_checksum(db_path) == checksum:
+        return False
+
+    version, stations = load_dataset()
+
+    with database.transaction(db_path) as conn:
+        conn.executemany(UPSERT_SQL, stations)
+        conn.executemany(
+            """
+            INSERT INTO dataset_meta (key, value) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+            """,
+            [("version", str(version)), ("checksum", checksum)],
+        )
+    # 唯讀 immutable 連線不讀 -wal
+    database.checkpoint(db_path)
+    return True
+
+
+# =========================
+# Snapshot
+# =========================
+_SNAPSHOT_FIELDS = ["code", "name", "search_key", "name_en", "name_pinyin"]
+
+
+def write_snapshot() -> Path:
+    """
+    由資料集產生精簡快照（每站一個 list，不重複欄位名稱）
+    """
+    version, stations = load_dataset()
+    doc = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "checksum": source_checksum(),
+        "fields": _SNAPSHOT_FIELDS,
+        "stations": [[st[k] for k in _SNAPSHOT_FIELDS] for st in stations],
+    }
+
+    path = snapshot_path()
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+    tmp.replace(path)
+    return path
+
+
+def load_snapshot() -> list[dict] | None:
+    """
+    讀取快照；不存在、格式不符或來源已變更時回傳 None
+    """
+    path = snapshot_path()
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if doc.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if doc.get("checksum") != source_checksum():
+        return None
+
+    fields = doc["fields"]
+    return [dict(zip(fields, row)) for row in doc["stations"]]
@@ -0,0 +1,166 @@
+"""
+車站使用熱度（frecency = 使用次數 × 時間衰減）
+- 啟動時由 recent_stations 載入，之後讀取只查記憶體
+- 每次使用：score = score × 衰減 + 1（半衰期 half_life_days）
+- 寫入 write-behind：標記 dirty，延遲 flush_delay 秒後以單一交易批次寫回
+  寫回固定由同一條背景 thread 執行（資料庫連線是 per-thread，不能每次開新 thread）
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+
+@dataclass(slots=True)
+class _Entry:
+    name: str
+    use_count: int
+    score: float
+    scored_at: float
+    used_at: str
+
+
+class StationFrecency:
+    """
+    各 thread 共用（autocomplete 的背景查詢也會讀取），以 lock 保護
+    """
+
+    def __init__(
+        self,
+        repo,
+        half_life_days: float = 14.0,
+        flush_delay: float = 2.0,
+    ):
+        self.repo = repo
+        self.flush_delay = flush_delay
+        self._decay = math.log(2) / (half_life_days * 86400)
+
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        self._dirty: set[str] = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+        for row in repo.load_all():
+            self._entries[row["code"]] = _Entry(
+                name=row["name"],
+                use_count=row["use_count"] or 1,
+                score=row["score"] or 1.0,
+                scored_at=row["scored_at"] or time.time(),
+                used_at=row["used_at"] or "",
+            )
+
+    # =========================
+    # Score
+    # =========================
+    def _current(self, entry: _Entry, now: float) -> float:
+        return entry.score * math.exp(-self._decay * max(now - entry.scored_at, 0))
+
+    def record(self, code: str, name: str, now: float | None = None):
+        """
+        記錄一次使用（只更新記憶體，稍後批次寫回）
+        """
+        now = time.time() if now is None else now
+        # 與 SQLite CURRENT_TIMESTAMP 一致（UTC）
+        used_at = datetime.fromtimestamp(now, timezone.utc).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                self._entries[code] = _Entry(name, 1, 1.0, now, used_at)
+            else:
+                entry.score = self._current(entry, now) + 1.0
+                entry.scored_at = now
+                entry.use_count += 1
+                entry.name = name
+                entry.used_at = used_at
+
+            self._dirty.add(code)
+            self._schedule_flush()
+
+    def scores(self, now: float | None = None) -> dict[str, float]:
+        """
+        {code: 目前分數}
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return {
+                code: self._current(entry, now)
+                for code, entry in self._entries.items()
+            }
+
+    def top(self, limit: int = 5, now: float | None = None) -> list[dict]:
+        """
+        分數最高的車站 [{"code", "name"}]
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            ranked = sorted(
+                self._entries.items(),
+                key=lambda item: self._current(item[1], now),
+                reverse=True,
+            )[:limit]
+            return [{"code": code, "name": e.name} for code, e in ranked]
+
+    # =========================
+    # Write-behind
+    # =========================
+    def _schedule_flush(self):
+        # 呼叫端已持有 _lock
+        if self._closed:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="StationFrecencyWriter",
+                daemon=True,
+            )
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # 延遲期間的使用一起寫回；close() 會中斷等待並自行寫完
+            if self._stop.wait(self.flush_delay):
+                return
+            self.flush()
+
+    def flush(self):
+        """
+        將變動過的車站一次寫回資料庫
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            rows = []
+            for code in dirty:
+                e = self._entries[code]
+                rows.append(
+                    (code, e.name, e.used_at, e.use_count, e.score, e.scored_at)
+                )
+
+        try:
+            self.repo.save_many(rows)
+        except Exception as e:
+            print(f"[StationFrecency] 無法寫入最近使用車站: {e}")
+            with self._lock:
+                self._dirty |= dirty
+
+    def close(self):
+        """
+        停止延遲寫入並寫完剩餘資料
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._stop.set()
+        self._wake.set()
+        if thread:
+            thread.join()
+        self.flush()
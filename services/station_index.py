@@ -0,0 +1,225 @@
+"""
+車站記憶體索引
+- 啟動時由 stations.db 建立一次，之後查詢不碰 SQLite
+- 站碼：prefix trie
+- 站名：1-gram / 2-gram 倒排索引
+- 排序：站碼完全相符 → 站碼前綴 → 站名前綴 → 其他包含
+- 站名比對使用正規化後的 search_key（臺/台、全形數字），查詢字串同樣正規化
+- 英文 / 拼音：前綴、包含，找不到時以 trigram 相似度容錯（taichng → Taichung）
+"""
+from typing import Iterable
+
+from core.text import fold_roman, fold_text
+
+# 排序層級
+EXACT_CODE = 0
+CODE_PREFIX = 1
+NAME_PREFIX = 2
+SUBSTRING = 3
+FUZZY = 4
+
+# trigram Jaccard 相似度下限
+FUZZY_THRESHOLD = 0.3
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        # 子樹內所有站（依站碼排序，因為依站碼順序插入）
+        self.ids: list[int] = []
+
+
+class StationIndex:
+    """
+    stations：[{"code", "name", "search_key", "name_en", "name_pinyin"}]
+    - search_key 可省略（以 fold_text(name) 計算）
+    - name_en / name_pinyin 可省略
+    - 站碼重複時保留第一筆
+    """
+
+    def __init__(self, stations: Iterable[dict]):
+        self._stations: list[dict] = []
+        self._keys: list[str] = []
+        self._romans: list[tuple[str, ...]] = []
+        # "\0taichung\0taizhong"：一次 in 就能判斷前綴 / 包含
+        self._roman_keys: list[str] = []
+        self._roman_grams: list[tuple[set[str], ...]] = []
+        self._by_code: dict[str, int] = {}
+
+        for st in sorted(stations, key=lambda s: s["code"]):
+            code = st["code"].strip()
+            if not code or code in self._by_code:
+                continue
+            name = st["name"].strip()
+            self._by_code[code] = len(self._stations)
+            self._stations.append({"code": code, "name": name})
+            self._keys.append(st.get("search_key") or fold_text(name))
+            self._romans.append(tuple(dict.fromkeys(
+                key for key in (
+                    fold_roman(st.get("name_en") or ""),
+                    fold_roman(st.get("name_pinyin") or ""),
+                ) if key
+            )))
+
+        self._trie = _TrieNode()
+        self._grams: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[int]] = {}
+
+        for i, st in enumerate(self._stations):
+            self._add_code(st["code"], i)
+            self._add_name(self._keys[i], i)
+            romans = self._romans[i]
+            self._roman_keys.append("".join("\0" + r for r in romans))
+            self._roman_grams.append(tuple(_trigrams(r) for r in romans))
+            for grams in self._roman_grams[i]:
+                for gram in grams:
+                    self._trigrams.setdefault(gram, set()).add(i)
+
+    def __len__(self):
+        return len(self._stations)
+
+    # =========================
+    # Build
+    # =========================
+    def _add_code(self, code: str, i: int):
+        node = self._trie
+        node.ids.append(i)
+        for ch in code:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.ids.append(i)
+
+    def _add_name(self, name: str, i: int):
+        for n in (1, 2):
+            for start in range(len(name) - n + 1):
+                self._grams.setdefault(name[start:start + n], set()).add(i)
+
+    # =========================
+    # Lookup
+    # =========================
+    def get(self, code: str) -> dict | None:
+        i = self._by_code.get(code)
+        return dict(self._stations[i]) if i is not None else None
+
+    def _code_prefix(self, prefix: str) -> list[int]:
+        node = self._trie
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+    def _name_contains(self, text: str) -> set[int]:
+        if len(text) == 1:
+            return self._grams.get(text, set())
+
+        # 取所有 2-gram 的交集，再確認真的包含（避免 2-gram 順序不符）
+        postings = []
+        for start in range(len(text) - 1):
+            ids = self._grams.get(text[start:start + 2])
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {i for i in candidates if text in self._keys[i]}
+
+    def _roman_matches(self, text: str) -> dict[int, tuple[int, float]]:
+        """
+        英文 / 拼音比對：{station: (層級, 分數)}
+        """
+        matches: dict[int, tuple[int, float]] = {}
+
+        prefix = "\0" + text
+        for i, key in enumerate(self._roman_keys):
+            if text in key:
+                matches[i] = (NAME_PREFIX if prefix in key else SUBSTRING, 0.0)
+
+        if matches or len(text) < 3:
+            return matches
+
+        # 容錯：共同 trigram 多的候選再算 Jaccard 相似度
+        grams = _trigrams(text)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for i in self._trigrams.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        for i in shared:
+            score = max(_similarity(grams, g) for g in self._roman_grams[i])
+            if score >= FUZZY_THRESHOLD:
+                matches[i] = (FUZZY, score)
+        return matches
+
+    def search(
+        self,
+        keyword: str,
+        limit: int = 10,
+        boosts: dict[str, float] | None = None,
+    ) -> list[dict]:
+        """
+        依相關度回傳 [{"code", "name"}]
+        - 接受「代碼-站名」格式（選取後的輸入框內容）
+        - 接受英文站名 / 漢語拼音（Taichung、taizhong）
+        - boosts：{code: 使用熱度}；同一層級內熱度高的優先
+        """
+        boosts = boosts or {}
+        kw = fold_text(keyword)
+        if not kw:
+            return []
+
+        code_part, sep, _ = kw.partition("-")
+        if sep and code_part in self._by_code:
+            kw = code_part
+
+        # (層級, 分數)；分數只用於容錯層級（越相似越前面）
+        rank: dict[int, tuple[int, float]] = {}
+
+        exact = self._by_code.get(kw)
+        if exact is not None:
+            rank[exact] = (EXACT_CODE, 0.0)
+
+        for i in self._code_prefix(kw):
+            rank.setdefault(i, (CODE_PREFIX, 0.0))
+
+        for i in self._name_contains(kw):
+            if i not in rank:
+                level = NAME_PREFIX if self._keys[i].startswith(kw) else SUBSTRING
+                rank[i] = (level, 0.0)
+
+        # 站碼中間包含（例：輸入 "00" 找 1000）；站碼很短，直接掃
+        if len(rank) < limit and kw.isdigit():
+            for code, i in self._by_code.items():
+                if kw in code:
+                    rank.setdefault(i, (SUBSTRING, 0.0))
+
+        roman = fold_roman(kw)
+        if roman and not roman.isdigit():
+            for i, match in self._roman_matches(roman).items():
+                if i not in rank or match < rank[i]:
+                    rank[i] = match
+
+        # 同層級：容錯以相似度高的優先，再依使用熱度；站名層級以站名短的
+        # 優先（「臺中」先於「臺中港」），其餘依站碼（index 即站碼順序）
+        def sort_key(i):
+            level, score = rank[i]
+            st = self._stations[i]
+            name_len = len(st["name"]) if level >= NAME_PREFIX else 0
+            return level, -score, -boosts.get(st["code"], 0.0), name_len, i
+
+        ordered = sorted(rank, key=sort_key)[:limit]
+        return [dict(self._stations[i]) for i in ordered]
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _similarity(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
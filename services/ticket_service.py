@@ -2,7 +2,7 @@ from browser.browser_manager import BrowserManager
 from browser.actions import TraTicketActions
 from browser.dom_watcher import DomWatcher
 from browser.page_loader import PageLoader
-from db.ticket_log_repo import TicketLogRepository
+from repository.ticket_log_repo import TicketLogWriter, get_log_writer
 from datetime import datetime
 
 TRA_TICKET_URL = "https://www.railway.gov.tw/tra-tip-web/tip/tip001/tip121/query"
@@ -15,11 +15,14 @@ class TicketService:
     - submit_booking：在排程時間按下送出
     """
 
-    def __init__(self):
+    def __init__(self, log_writer: TicketLogWriter | None = None):
         self.browser = BrowserManager()
         self.driver = None
         self.actions = None
 
+        # 訂票結果由背景寫入，送出流程不等待磁碟
+        self.log_writer = log_writer or get_log_writer()
+
         # ===== 保留訂票狀態（給 submit 用）=====
         self._prepared = False
         self._booking_context = {}
@@ -53,11 +56,14 @@ class TicketService:
         train_nos: list[str],
         ticket_count: int,
         one_way: bool = True,
+        request_id: int | None = None,
     ):
         """
         1. 立刻開啟 Selenium
         2. 填完所有資料
         3. 停在「確認送出前」
+
+        request_id：ticket_request_log 的 id，會寫入每筆訂票結果
         """
 
         if not train_nos:
@@ -88,6 +94,7 @@ class TicketService:
 
         # ===== 儲存狀態給 submit 使用 =====
         self._booking_context = {
+            "request_id": request_id,
             "employee_id": employee_id,
             "travel_date": formatted_date,
             "from_station": from_station,
@@ -117,37 +124,41 @@ class TicketService:
             self.actions.click_submit()
 
             # ===== 成功紀錄 =====
-            for train_no in ctx["train_nos"]:
-                TicketLogRepository.insert(
-                    employee_id=ctx["employee_id"],
-                    travel_date=ctx["travel_date"],
-                    start_station=ctx["from_station"],
-                    end_station=ctx["to_station"],
-                    train_no=train_no,
-                    ticket_qty=ctx["ticket_count"],
-                    status="SUCCESS",
-                    message="訂票已送出"
-                )
+            self.log_writer.write(
+                self._result_records(ctx, "SUCCESS", "訂票已送出")
+            )
 
         except Exception as e:
             # ===== 失敗紀錄 =====
-            for train_no in ctx["train_nos"]:
-                TicketLogRepository.insert(
-                    employee_id=ctx["employee_id"],
-                    travel_date=ctx["travel_date"],
-                    start_station=ctx["from_station"],
-                    end_station=ctx["to_station"],
-                    train_no=train_no,
-                    ticket_qty=ctx["ticket_count"],
-                    status="FAILED",
-                    message=str(e)
-                )
+            self.log_writer.write(
+                self._result_records(ctx, "FAILED", str(e))
+            )
             raise
 
         finally:
             # 避免重複送出
             self._prepared = False
 
+    @staticmethod
+    def _result_records(ctx: dict, status: str, message: str) -> list[dict]:
+        """
+        一次送出 → 每個車次一筆紀錄
+        """
+        return [
+            {
+                "request_id": ctx.get("request_id"),
+                "employee_id": ctx["employee_id"],
+                "travel_date": ctx["travel_date"],
+                "start_station": ctx["from_station"],
+                "end_station": ctx["to_station"],
+                "train_no": train_no,
+                "ticket_qty": ctx["ticket_count"],
+                "status": status,
+                "message": message,
+            }
+            for train_no in ctx["train_nos"]
+        ]
+
 # from browser.browser_manager import BrowserManager
 # from browser.actions import TraTicketActions
 # from browser.dom_watcher import DomWatcher
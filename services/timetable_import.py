@@ -0,0 +1,82 @@
+"""
+台鐵時刻表匯入（交通部 TDX / PTX 開放資料 JSON）
+- TDX v3 DailyTrainTimetable：{"TrainDate", "TrainTimetables": [{"TrainInfo", "StopTimes"}]}
+- PTX v2 DailyTimetable：[{"TrainDate", "DailyTrainInfo", "StopTimes"}]
+- 沒有 TrainDate 的定期時刻表（GeneralTrainTimetable）需指定 train_date
+- 每個日期以單一交易整批取代
+"""
+import json
+from pathlib import Path
+
+from repository.timetable_repo import TimetableRepository
+
+_TRAIN_INFO_KEYS = ("TrainInfo", "DailyTrainInfo", "GeneralTrainInfo")
+
+
+def _train_entries(doc) -> list[dict]:
+    if isinstance(doc, list):
+        return doc
+    for key in ("TrainTimetables", "TrainTimetableList", "DailyTrainTimetables"):
+        if key in doc:
+            return doc[key]
+    raise ValueError("無法辨識的時刻表格式")
+
+
+def _train_no(entry: dict) -> str:
+    for key in _TRAIN_INFO_KEYS:
+        info = entry.get(key)
+        if info and info.get("TrainNo"):
+            return str(info["TrainNo"]).strip()
+    if entry.get("TrainNo"):
+        return str(entry["TrainNo"]).strip()
+    raise ValueError("車次資料缺少 TrainNo")
+
+
+def parse_timetable(doc, train_date: str | None = None) -> dict[str, dict[str, list[tuple]]]:
+    """
+    回傳 {train_date: {train_no: [(stop_seq, station_code, arrival, departure)]}}
+    - train_date：指定時覆蓋檔案內的日期
+    """
+    default_date = None if isinstance(doc, list) else doc.get("TrainDate")
+    result: dict[str, dict[str, list[tuple]]] = {}
+
+    for entry in _train_entries(doc):
+        date = train_date or entry.get("TrainDate") or default_date
+        if not date:
+            raise ValueError("時刻表沒有 TrainDate，請指定日期")
+        date = str(date).replace("/", "-")[:10]
+
+        train_no = _train_no(entry)
+        stops = sorted(
+            (
+                int(stop["StopSequence"]),
+                str(stop["StationID"]).strip(),
+                stop.get("ArrivalTime"),
+                stop.get("DepartureTime"),
+            )
+            for stop in entry.get("StopTimes") or []
+        )
+        if not stops:
+            continue
+        result.setdefault(date, {})[train_no] = stops
+
+    return result
+
+
+def import_file(path, train_date: str | None = None) -> dict[str, int]:
+    """
+    匯入時刻表檔案；回傳 {train_date: 車次數}
+    """
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8-sig") as f:
+            doc = json.load(f)
+    except OSError as e:
+        raise ValueError(f"無法讀取時刻表：{e}") from e
+
+    imported = {}
+    for date, trains in parse_timetable(doc, train_date).items():
+        imported[date] = TimetableRepository.replace_date(
+            date, trains.items(), source=path.name
+        )
+    return imported
@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from db import database  # noqa: E402
+
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch):
+    """
+    將所有資料庫指到暫存目錄並套用最新 schema
+    """
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "ticket.db")
+    monkeypatch.setattr(database, "EMPLOYEE_DB_PATH", tmp_path / "employees.db")
+    monkeypatch.setattr(database, "STATION_DB_PATH", tmp_path / "stations.db")
+
+    database.init_db()
+    yield tmp_path
+    database.close_all_connections()
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from db.database import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectionManager(retries=3, retry_delay=0.01, attempt_timeout_ms=10)
+    path = tmp_path / "test.db"
+    with manager.transaction(path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+    yield manager, path
+    manager.close_all()
+
+
+def values(manager, path) -> list[int]:
+    rows = manager.get(path).execute("SELECT v FROM t ORDER BY v").fetchall()
+    return [r[0] for r in rows]
+
+
+def test_connection_is_reused_per_thread(manager):
+    manager, path = manager
+    conn = manager.get(path)
+    assert manager.get(path) is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(manager.get(path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_nested_transaction_joins_outer(manager):
+    manager, path = manager
+    with manager.transaction(path) as outer:
+        outer.execute("INSERT INTO t VALUES (1)")
+        with manager.transaction(path) as inner:
+            assert inner is outer
+            inner.execute("INSERT INTO t VALUES (2)")
+        assert outer.in_transaction
+
+    assert values(manager, path) == [1, 2]
+
+
+def test_error_rolls_back_whole_transaction(manager):
+    manager, path = manager
+    with pytest.raises(ValueError):
+        with manager.transaction(path) as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            with manager.transaction(path) as inner:
+                inner.execute("INSERT INTO t VALUES (2)")
+                raise ValueError("boom")
+
+    assert values(manager, path) == []
+    assert not manager.get(path).in_transaction
+
+
+def hold_write_lock(path) -> sqlite3.Connection:
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    return other
+
+
+def test_locked_write_gives_up_after_bounded_retries(manager):
+    manager, path = manager
+    other = hold_write_lock(path)
+    try:
+        start = time.monotonic()
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            with manager.transaction(path):
+                pass
+        # 4 次嘗試 × 10 ms + 退避 10 + 20 + 40 ms；不會每次再等滿 busy_timeout
+        assert time.monotonic() - start < 1.0
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    # busy_timeout 恢復為一般讀寫用的值
+    assert manager.get(path).execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_locked_write_succeeds_once_lock_is_released(manager):
+    manager, path = manager
+    other = hold_write_lock(path)
+    release = threading.Timer(0.03, lambda: other.execute("ROLLBACK"))
+    release.start()
+    try:
+        with manager.transaction(path) as conn:
+            conn.execute("INSERT INTO t VALUES (7)")
+    finally:
+        release.join()
+        other.close()
+
+    assert values(manager, path) == [7]
@@ -0,0 +1,117 @@
+import pytest
+
+from domain.employee import Employee
+from repository.ticket_log_repo import TicketLogRepository
+from repository.ticket_request_repo import TicketRequestRepository
+
+
+def submit_request(train_nos=("123",), employee_id="E001", date="2026-11-02") -> int:
+    return TicketRequestRepository.insert(
+        employee_id=employee_id,
+        start_station="1000",
+        end_station="3300",
+        trip_type="ONE_WAY",
+        ticket_count=1,
+        travel_date=date,
+        train_nos=list(train_nos),
+        is_scheduled=False,
+        scheduled_at=None,
+    )
+
+
+def log_result(request_id: int, train_no: str, status: str):
+    TicketLogRepository.insert_many([{
+        "request_id": request_id,
+        "employee_id": "E001",
+        "travel_date": "2026/11/02",
+        "start_station": "1000",
+        "end_station": "3300",
+        "train_no": train_no,
+        "ticket_qty": 1,
+        "status": status,
+    }])
+
+
+def find(train_nos=("123",), employee_id="E001", date="2026-11-02"):
+    return TicketRequestRepository.find_active_duplicate(
+        employee_id=employee_id, travel_date=date, train_nos=list(train_nos)
+    )
+
+
+def test_pending_request_blocks_resubmit(app_db):
+    request_id = submit_request(["123", "125"])
+
+    row = find(["125"])
+    assert (row["request_id"], row["train_no"], row["status"]) == (request_id, "125", "PENDING")
+    # 日期格式（/ 或 -）、其他員工、其他車次不受影響
+    assert find(["125"], date="2026/11/02") is not None
+    assert find(["125"], employee_id="E002") is None
+    assert find(["127"]) is None
+
+
+def test_success_from_order_log_still_blocks(app_db):
+    request_id = submit_request(["123"])
+    log_result(request_id, "123", "SUCCESS")
+
+    assert find(["123"])["status"] == "SUCCESS"
+
+
+@pytest.mark.parametrize("status", ["FAILED", "UNKNOWN"])
+def test_failed_or_unknown_result_allows_resubmit(app_db, status):
+    request_id = submit_request(["123", "125"])
+    log_result(request_id, "123", status)
+    assert find(["123"]) is None
+    assert find(["125"])["status"] == "PENDING"
+
+    TicketRequestRepository.mark_status(request_id, status)
+    assert find(["123", "125"]) is None
+
+
+def test_leading_zero_is_same_train(app_db):
+    request_id = submit_request(["0123", "123", "125"])
+
+    assert find(["123"])["train_no"] == "123"
+    assert find(["00125"])["request_id"] == request_id
+    assert [r[9] for r in TicketRequestRepository.find_by_train("0123", "2026-11-02")] == [request_id]
+
+    # 訂票結果記的是使用者輸入的原樣
+    log_result(request_id, "0123", "FAILED")
+    assert find(["123"]) is None
+    assert find(["125"])["status"] == "PENDING"
+
+
+class FakeTicketService:
+    def __init__(self):
+        self.prepared = []
+
+    def prepare_booking(self, **kwargs):
+        self.prepared.append(kwargs)
+
+    def submit_booking(self):
+        pass
+
+
+def test_controller_duplicate_guard(app_db, monkeypatch):
+    pytest.importorskip("PySide6")
+    pytest.importorskip("selenium")
+    from controller import ticket_controller
+    from core.exceptions import DuplicateRequestError
+
+    monkeypatch.setattr(ticket_controller, "TicketService", FakeTicketService)
+    controller = ticket_controller.TicketController()
+    kwargs = dict(
+        employee=Employee("E001", "王小明", "A123456789", "資訊部"),
+        from_station="1000",
+        to_station="3300",
+        date="2026-11-02",
+        train_nos=["123"],
+        ticket_count=1,
+        one_way=True,
+    )
+
+    controller.submit_ticket(**kwargs)
+    with pytest.raises(DuplicateRequestError):
+        controller.submit_ticket(**kwargs)
+    controller.submit_ticket(**kwargs, allow_duplicate=True)
+
+    assert len(controller.service.prepared) == 2
@@ -0,0 +1,29 @@
+import inspect
+from dataclasses import fields
+from datetime import date
+
+from domain.employee import Employee
+
+
+def test_hydrate_sets_every_field_by_name():
+    params = list(inspect.signature(Employee.hydrate).parameters)
+    assert sorted(params) == sorted(f.name for f in fields(Employee))
+
+    values = dict(
+        emp_id="E001",
+        name="王小明",
+        id_number="A123456789",
+        department="資訊部",
+        is_active=False,
+        hired_date=date(2024, 2, 1),
+    )
+    hydrated = Employee.hydrate(**values)
+
+    assert hydrated == Employee(**values)
+    assert {f.name: getattr(hydrated, f.name) for f in fields(Employee)} == values
+
+
+def test_activate_round_trip_keeps_fields():
+    emp = Employee("E001", "王小明", "A123456789", "資訊部", hired_date=date(2024, 2, 1))
+    assert emp.deactivate().activate() == emp
+    assert emp.deactivate().is_active is False
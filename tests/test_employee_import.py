@@ -0,0 +1,142 @@
+import json
+
+from db import database
+from domain.employee import Employee
+from repository.employee_repository import EmployeeRepository
+from services import employee_io
+from services.employee_service import EmployeeService
+
+
+def make_service() -> EmployeeService:
+    return EmployeeService(EmployeeRepository(database.EMPLOYEE_DB_PATH))
+
+
+def row(emp_id, name="王小明", id_number="A123456789", department="資訊部", **extra):
+    return {
+        "emp_id": emp_id,
+        "name": name,
+        "id_number": id_number,
+        "department": department,
+        **extra,
+    }
+
+
+def test_row_errors_do_not_stop_the_import(app_db):
+    service = make_service()
+    service.hire_employee("E900", "既有員工", "B123456789", "人事部")
+
+    result = service.import_employees([
+        (2, row("E001", is_active="是的")),
+        (3, row("E002", hired_date="2024-13-01")),
+        (4, row("E003", hired_date="2024/02/01", is_active="停用")),
+        (5, row("E003", name="重複")),
+        (6, row("E900")),
+        (7, None),
+        (8, row("E004", id_number="bad")),
+        (9, row("E005", id_number="a123456789")),
+    ], chunk_size=2)
+
+    assert result.imported == 2
+    assert result.failed == 6
+    assert [line for line, _ in result.errors] == [2, 3, 5, 6, 7, 8]
+    assert "is_active" in result.errors[0][1]
+    assert "在檔案中重複" in result.errors[2][1]
+    assert "已存在" in result.errors[3][1]
+
+    e003 = service.get_employee("E003")
+    assert (e003.is_active, e003.hired_date.isoformat()) == (False, "2024-02-01")
+    assert service.get_employee("E005").id_number == "A123456789"
+    assert service.get_employee("E900").name == "既有員工"
+
+
+def test_chunk_boundaries(app_db, monkeypatch):
+    service = make_service()
+    chunks = []
+    real_add_many = service.repo.add_many
+
+    def add_many(employees):
+        chunks.append(len(employees))
+        return real_add_many(employees)
+
+    monkeypatch.setattr(service.repo, "add_many", add_many)
+    records = [(n, row(f"E{n:03d}")) for n in range(1, 8)]
+    # 重複的 emp_id 不佔 chunk 位置
+    records.insert(3, (99, row("E001")))
+
+    result = service.import_employees(records, chunk_size=3)
+
+    assert chunks == [3, 3, 1]
+    assert (result.imported, result.failed) == (7, 1)
+    assert [e.emp_id for e in service.list_employees()] == [f"E{n:03d}" for n in range(1, 8)]
+
+
+def test_import_drops_warm_cache(app_db):
+    service = make_service()
+    service.hire_employee("E001", "王小明", "A123456789", "資訊部")
+    assert len(service.list_employees()) == 1
+
+    service.import_employees([(2, row("E002"))])
+
+    assert service.repo._cache is None
+    assert [e.emp_id for e in service.list_employees()] == ["E001", "E002"]
+
+
+def test_export_import_round_trip(app_db, tmp_path):
+    service = make_service()
+    service.import_employees([
+        (1, row("E001", hired_date="2024-02-01")),
+        (2, row("E002", name="陳美麗", department="財務部", is_active=0)),
+    ])
+    expected = service.list_employees()
+
+    for suffix in (".csv", ".jsonl"):
+        path = tmp_path / f"employees{suffix}"
+        assert service.export_file(path) == 2
+
+        assert [
+            employee_io.to_employee(record) for _, record in employee_io.read_records(path)
+        ] == expected
+
+    lines = (tmp_path / "employees.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[1])["name"] == "陳美麗"
+    assert (tmp_path / "employees.csv").read_bytes().startswith(b"\xef\xbb\xbf")
+
+
+def test_read_records_reports_bad_json_lines(tmp_path):
+    path = tmp_path / "employees.jsonl"
+    path.write_text(
+        json.dumps(row("E001")) + "\n\n{not json\n[1, 2]\n",
+        encoding="utf-8",
+    )
+    records = list(employee_io.read_records(path))
+
+    assert [line for line, _ in records] == [1, 3, 4]
+    assert isinstance(employee_io.to_employee(records[0][1]), Employee)
+    assert records[1][1] is None and records[2][1] is None
+
+
+def test_default_chunk_imports_in_one_pass(app_db):
+    service = make_service()
+    service.hire_employee("E00500", "既有員工", "B123456789", "人事部")
+
+    records = [(n, row(f"E{n:05d}")) for n in range(1, 2501)]
+    result = service.import_employees(records)
+
+    assert (result.imported, result.failed) == (2499, 1)
+    assert result.errors == [(500, "員工 E00500 已存在")]
+
+
+def test_unreadable_csv_row_is_reported_per_line(app_db, tmp_path):
+    path = tmp_path / "employees.csv"
+    lines = [
+        ",".join(employee_io.FIELDS),
+        "E001,王小明,A123456789,資訊部,1,",
+        "E002," + "x" * 200_000 + ",A123456789,資訊部,1,",
+        "E003,陳小華,A123456789,資訊部,1,",
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    result = make_service().import_file(path)
+
+    assert result.imported == 2
+    assert result.errors == [(3, "無法解析")]
@@ -0,0 +1,63 @@
+from db import database
+from domain.employee import Employee
+from repository.employee_repository import EmployeeRepository
+
+
+def make_repo() -> EmployeeRepository:
+    repo = EmployeeRepository(database.EMPLOYEE_DB_PATH)
+    for emp_id, name, dept, active in [
+        ("A001", "王小明", "資訊部", True),
+        ("A002", "陳小明", "業務部", False),
+        ("B010", "李大同", "資訊部", True),
+        ("B011", "林美麗", "財務部", True),
+    ]:
+        repo.add(Employee(emp_id, name, "A123456789", dept, is_active=active))
+    return repo
+
+
+def ids(employees) -> list[str]:
+    return [e.emp_id for e in employees]
+
+
+def test_search_matches_inside_names_and_ids(app_db):
+    repo = make_repo()
+    assert repo.has_fts()
+
+    assert ids(repo.search("小明")) == ["A001", "A002"]
+    assert ids(repo.search("王小明")) == ["A001"]
+    assert ids(repo.search("001")) == ["A001"]
+    assert ids(repo.search("b01")) == ["B010", "B011"]
+    assert ids(repo.search("資訊部 大同")) == ["B010"]
+    assert ids(repo.search("小明", active_only=True)) == ["A001"]
+    assert repo.search("  ") == []
+    assert repo.search('"%_') == []
+
+
+def test_search_follows_updates(app_db):
+    repo = make_repo()
+    emp = repo.get("B011")
+    repo.update(Employee(emp.emp_id, "林美華", emp.id_number, emp.department))
+
+    assert ids(repo.search("林美華")) == ["B011"]
+    assert repo.search("林美麗") == []
+
+
+def test_search_without_fts_uses_like(app_db):
+    repo = make_repo()
+    repo._fts = False
+
+    assert ids(repo.search("小明")) == ["A001", "A002"]
+    assert ids(repo.search("王小明")) == ["A001"]
+    assert ids(repo.search("資訊部 01")) == ["A001", "B010"]
+
+
+def test_name_prefix_pages_by_name(app_db):
+    repo = make_repo()
+    repo.add(Employee("A000", "王大明", "A123456789", "資訊部"))
+
+    first = repo.query(name_prefix="王", limit=1)
+    key = EmployeeRepository.page_key(first[-1], name_prefix="王")
+    second = repo.query(name_prefix="王", after=key, limit=1)
+
+    assert [e.name for e in first + second] == ["王大明", "王小明"]
+    assert repo.query(name_prefix="王", after=("王小明", "A001")) == []
@@ -0,0 +1,203 @@
+"""
+舊版 ticket.db 升級到最新 schema（既有資料必須保留）
+"""
+import sqlite3
+
+import pytest
+
+from db import database
+from db.migrations import latest_version
+from repository.ticket_stats_repo import TicketStatsRepository
+
+ORDER_LOG_SQL = """
+CREATE TABLE ticket_order_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id TEXT,
+    order_time TEXT,
+    travel_date TEXT,
+    start_station TEXT,
+    end_station TEXT,
+    train_no TEXT,
+    ticket_qty INTEGER,
+    status TEXT,
+    message TEXT,
+    created_at TEXT
+)
+"""
+
+# 舊版 init_db()：身分證欄位名為 id_number，沒有 employee_name
+INIT_DB_SHAPE = """
+CREATE TABLE ticket_request_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id TEXT NOT NULL,
+    id_number TEXT NOT NULL,
+    start_station TEXT NOT NULL,
+    end_station TEXT NOT NULL,
+    trip_type TEXT NOT NULL,
+    ticket_count INTEGER NOT NULL,
+    travel_date TEXT NOT NULL,
+    train_nos TEXT NOT NULL,
+    is_scheduled INTEGER NOT NULL,
+    scheduled_at TEXT,
+    requested_at TEXT NOT NULL
+)
+"""
+
+# 原本隨 repo 發佈的 db/ticket.db（user_version 0，含員工快照欄位）
+BASELINE_SHAPE = """
+CREATE TABLE ticket_request_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id TEXT NOT NULL,
+    employee_name TEXT NOT NULL,
+    employee_id_number TEXT NOT NULL,
+    start_station TEXT NOT NULL,
+    end_station TEXT NOT NULL,
+    trip_type TEXT NOT NULL,
+    ticket_count INTEGER NOT NULL,
+    travel_date TEXT NOT NULL,
+    train_nos TEXT NOT NULL,
+    is_scheduled INTEGER NOT NULL,
+    scheduled_at TEXT,
+    requested_at TEXT NOT NULL
+)
+"""
+
+REQUESTS = [
+    # id, employee_id, id_number, start, end, travel_date, train_nos, requested_at
+    (1, "E001", "A123456789", "1000", "3300", "2025/12/01", "123,125,0125", "2025-11-20T09:00:00"),
+    (2, "E001", "A123456789", "1000", "3300", "2025/12/02", "0127", "2025-11-21T09:00:00"),
+    (3, "E002", "B223456789", "3300", "1000", "2025-12-03", "152", "2025-11-21T10:00:00"),
+]
+
+ORDERS = [
+    ("E001", "2025/12/01", "1000", "3300", "123", 1, "SUCCESS", "", "2025-11-20 09:01:00"),
+    ("E001", "2025/12/02", "1000", "3300", "127", 1, "FAILED", "售完", "2025-11-21 09:01:00"),
+]
+
+
+def seed_legacy(path, shape: str):
+    conn = sqlite3.connect(path)
+    conn.execute(ORDER_LOG_SQL)
+    conn.execute(shape)
+    id_column = "id_number" if "employee_name" not in shape else "employee_id_number"
+    extra = "" if id_column == "id_number" else ", employee_name"
+    for row_id, emp, id_no, start, end, date, trains, at in REQUESTS:
+        values = [row_id, emp, id_no, start, end, "ONE_WAY", 1, date, trains, 0, None, at]
+        if extra:
+            values.insert(2, "王小明")
+        conn.execute(
+            f"""
+            INSERT INTO ticket_request_log (
+                id, employee_id{extra}, {id_column}, start_station, end_station,
+                trip_type, ticket_count, travel_date, train_nos,
+                is_scheduled, scheduled_at, requested_at
+            ) VALUES ({", ".join("?" * len(values))})
+            """,
+            values,
+        )
+    conn.executemany(
+        """
+        INSERT INTO ticket_order_log (
+            employee_id, travel_date, start_station, end_station,
+            train_no, ticket_qty, status, message, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        ORDERS,
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.parametrize("shape", [INIT_DB_SHAPE, BASELINE_SHAPE], ids=["init_db", "baseline"])
+def test_legacy_ticket_db_upgrades_with_rows(tmp_path, monkeypatch, shape):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "ticket.db")
+    monkeypatch.setattr(database, "EMPLOYEE_DB_PATH", tmp_path / "employees.db")
+    monkeypatch.setattr(database, "STATION_DB_PATH", tmp_path / "stations.db")
+    seed_legacy(tmp_path / "ticket.db", shape)
+
+    try:
+        database.init_db()
+        conn = database.get_connection()
+
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == latest_version("ticket")
+
+        requests = conn.execute(
+            "SELECT id, employee_id, employee_id_number, train_nos"
+            " FROM ticket_request_log ORDER BY id"
+        ).fetchall()
+        assert [tuple(r) for r in requests] == [
+            (row_id, emp, id_no, trains)
+            for row_id, emp, id_no, _, _, _, trains, _ in REQUESTS
+        ]
+
+        trains = conn.execute(
+            "SELECT request_id, train_no, travel_date, employee_id, status"
+            " FROM ticket_request_train ORDER BY request_id, train_no"
+        ).fetchall()
+        assert [tuple(r) for r in trains] == [
+            (1, "123", "2025-12-01", "E001", "SUCCESS"),
+            (1, "125", "2025-12-01", "E001", "UNKNOWN"),
+            (2, "127", "2025-12-02", "E001", "FAILED"),
+            (3, "152", "2025-12-03", "E002", "UNKNOWN"),
+        ]
+
+        (orders,), = conn.execute("SELECT COUNT(*) FROM ticket_order_log").fetchall()
+        assert orders == len(ORDERS)
+
+        stats = conn.execute(
+            "SELECT employee_id, day, requests, successes, failures"
+            " FROM ticket_daily_stats ORDER BY employee_id, day"
+        ).fetchall()
+        assert [tuple(r) for r in stats] == [
+            ("E001", "2025-11-20", 1, 1, 0),
+            ("E001", "2025-11-21", 1, 0, 1),
+            ("E002", "2025-11-21", 1, 0, 0),
+        ]
+
+        routes = conn.execute(
+            "SELECT start_station, end_station, requests"
+            " FROM ticket_route_stats ORDER BY start_station"
+        ).fetchall()
+        assert [tuple(r) for r in routes] == [("1000", "3300", 2), ("3300", "1000", 1)]
+    finally:
+        database.close_all_connections()
+
+
+def test_order_rows_without_timestamp_do_not_break_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "ticket.db")
+    monkeypatch.setattr(database, "EMPLOYEE_DB_PATH", tmp_path / "employees.db")
+    monkeypatch.setattr(database, "STATION_DB_PATH", tmp_path / "stations.db")
+    seed_legacy(tmp_path / "ticket.db", BASELINE_SHAPE)
+
+    insert_order = """
+    INSERT INTO ticket_order_log (employee_id, order_time, train_no, status, created_at)
+    VALUES (?, ?, '123', ?, ?)
+    """
+    legacy = sqlite3.connect(tmp_path / "ticket.db")
+    legacy.executemany(insert_order, [
+        ("E002", "2025-11-21 10:05:00", "SUCCESS", None),   # 改用 order_time
+        ("E002", None, "FAILED", "not a timestamp"),        # 不計入
+    ])
+    legacy.commit()
+    legacy.close()
+
+    try:
+        database.init_db()
+        conn = database.get_connection()
+        # 升級後的 trigger 同樣處理
+        conn.executemany(insert_order, [
+            ("E002", "2025-11-21 11:00:00", "FAILED", None),
+            ("E002", None, "SUCCESS", None),
+        ])
+
+        def e002_stats():
+            return [tuple(r) for r in conn.execute(
+                "SELECT day, requests, successes, failures"
+                " FROM ticket_daily_stats WHERE employee_id = 'E002'"
+            )]
+
+        assert e002_stats() == [("2025-11-21", 1, 1, 1)]
+        TicketStatsRepository.rebuild()
+        assert e002_stats() == [("2025-11-21", 1, 1, 1)]
+    finally:
+        database.close_all_connections()
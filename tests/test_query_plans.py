@@ -0,0 +1,154 @@
+"""
+EXPLAIN QUERY PLAN 回歸測試
+- 確保 UI / 報表用的查詢走索引，不會退回全表掃描或額外排序
+"""
+from db import database
+from db.database import get_connection
+from repository.employee_repository import EmployeeRepository
+from repository.ticket_log_repo import TicketLogRepository
+from repository.ticket_request_repo import TicketRequestRepository
+from repository.ticket_route_repo import TicketRouteRepository
+from repository.ticket_stats_repo import TicketStatsRepository
+from repository.timetable_repo import TimetableRepository
+
+
+def query_plan(sql: str, params=()) -> str:
+    return query_plan_on(None, sql, params)
+
+
+def query_plan_on(db_path, sql: str, params=()) -> str:
+    rows = get_connection(db_path).execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    return "\n".join(row["detail"] for row in rows)
+
+
+def assert_uses_index(plan: str, index_name: str):
+    assert index_name in plan, plan
+    assert "USE TEMP B-TREE" not in plan, plan
+
+
+def test_recent_requests_use_requested_at_index(app_db):
+    plan = query_plan(TicketRequestRepository.FETCH_RECENT_SQL, (100,))
+    assert_uses_index(plan, "idx_ticket_request_log_requested_at")
+
+
+def test_orders_by_employee_use_employee_date_index(app_db):
+    plan = query_plan(
+        TicketLogRepository.FETCH_BY_EMPLOYEE_SQL,
+        ("E001", "2026/01/01", "2026/12/31", 100),
+    )
+    assert_uses_index(plan, "idx_ticket_order_log_employee_date")
+
+
+def test_status_counts_are_covered_by_index(app_db):
+    plan = query_plan(
+        TicketLogRepository.STATUS_COUNTS_SQL,
+        ("E001", "2026/01/01", "2026/12/31"),
+    )
+    assert "COVERING INDEX idx_ticket_order_log_employee_date" in plan, plan
+
+
+def test_orders_by_status_use_status_index(app_db):
+    plan = query_plan(TicketLogRepository.FETCH_BY_STATUS_SQL, ("FAILED", 50))
+    assert_uses_index(plan, "idx_ticket_order_log_status")
+
+
+def test_request_log_pages_seek_by_keyset(app_db):
+    plan = query_plan(
+        TicketRequestRepository.FETCH_PAGE_SQL,
+        ("2026-01-20T10:00:00", 42, 100),
+    )
+    assert_uses_index(plan, "idx_ticket_request_log_requested_at")
+    assert plan.startswith("SEARCH"), plan
+
+
+def test_request_log_joins_employees_and_stations_by_index(app_db):
+    plan = query_plan(TicketRequestRepository.FETCH_RECENT_SQL, (100,))
+    assert "sqlite_autoindex_employees_1 (emp_id=?)" in plan, plan
+    assert "ux_stations_code (code=?)" in plan, plan
+
+
+def test_requests_by_train_use_child_table_index(app_db):
+    plan = query_plan(
+        TicketRequestRepository.FIND_BY_TRAIN_SQL,
+        ("402", "2026-01-20", "2026-01-20"),
+    )
+    assert_uses_index(plan, "idx_ticket_request_train_lookup")
+
+
+def test_outcomes_of_request_use_request_index(app_db):
+    plan = query_plan(TicketLogRepository.FETCH_BY_REQUEST_SQL, (1,))
+    assert_uses_index(plan, "idx_ticket_order_log_request")
+
+
+def test_request_history_joins_outcomes_by_index(app_db):
+    plan = query_plan(TicketRequestRepository.FETCH_HISTORY_SQL, (1,))
+    assert "idx_ticket_order_log_request (request_id=?)" in plan, plan
+    assert "SCAN" not in plan, plan
+
+
+def test_duplicate_guard_uses_guard_index(app_db):
+    plan = query_plan(
+        TicketRequestRepository.FIND_DUPLICATE_SQL,
+        ("E001", "2026-01-20", "402"),
+    )
+    assert "idx_ticket_request_train_guard" in plan, plan
+    assert "SCAN" not in plan, plan
+
+
+def test_daily_totals_use_day_index(app_db):
+    plan = query_plan(
+        TicketStatsRepository.TOTALS_BY_DAY_SQL,
+        ("2026-01-20", "2026-01-20"),
+    )
+    assert "idx_ticket_daily_stats_day" in plan, plan
+    assert "SCAN" not in plan, plan
+
+
+def employee_plan(**filters) -> str:
+    sql, params = EmployeeRepository.build_query(**filters)
+    return query_plan_on(database.EMPLOYEE_DB_PATH, sql, params)
+
+
+def test_active_employees_use_partial_index(app_db):
+    plan = employee_plan(active_only=True, after="E100", limit=50)
+    assert_uses_index(plan, "idx_employees_active")
+
+
+def test_employees_by_department_use_department_index(app_db):
+    plan = employee_plan(department="IT", after="E100", limit=50)
+    assert_uses_index(plan, "idx_employees_department")
+
+
+def test_employees_by_name_prefix_use_name_index(app_db):
+    plan = employee_plan(name_prefix="王", limit=50)
+    assert "idx_employees_name (name>? AND name<?)" in plan, plan
+    assert_uses_index(plan, "idx_employees_name")
+
+    plan = employee_plan(name_prefix="王", after=("王小明", "E001"), limit=50)
+    assert_uses_index(plan, "idx_employees_name")
+
+    plan = employee_plan(active_only=True, name_prefix="王", limit=50)
+    assert_uses_index(plan, "idx_employees_name")
+
+
+def test_employee_search_uses_fts_index(app_db):
+    sql = EmployeeRepository.SEARCH_FTS_SQL.format(active="")
+    plan = query_plan_on(
+        database.EMPLOYEE_DB_PATH, sql,
+        (EmployeeRepository.match_expression("王 IT"), 50),
+    )
+    assert "VIRTUAL TABLE INDEX" in plan, plan
+    assert "INTEGER PRIMARY KEY" in plan, plan
+
+
+def test_top_destinations_use_route_index(app_db):
+    plan = query_plan(TicketRouteRepository.TOP_DESTINATIONS_SQL, ("1000", 5))
+    assert_uses_index(plan, "idx_ticket_route_stats_popular")
+
+
+def test_timetable_lookup_seeks_by_primary_key(app_db):
+    plan = query_plan(
+        TimetableRepository.TRAIN_STOPS_SQL,
+        ("1000", "3300", "2026-11-02", "123"),
+    )
+    assert "USING PRIMARY KEY (train_date=? AND train_no=?)" in plan, plan
@@ -0,0 +1,62 @@
+import json
+import shutil
+
+from db import database
+from services import station_dataset
+
+
+def use_data_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("stations.json", "station_names.json"):
+        shutil.copy(database.DATA_DIR / name, data_dir / name)
+    monkeypatch.setattr(database, "DATA_DIR", data_dir)
+    return data_dir
+
+
+def query(sql):
+    return database.get_connection(database.STATION_DB_PATH).execute(sql).fetchall()
+
+
+def test_apply_dataset_is_idempotent(app_db, monkeypatch):
+    use_data_dir(app_db, monkeypatch)
+
+    assert station_dataset.apply_dataset() is True
+    assert station_dataset.apply_dataset() is False
+    assert station_dataset.apply_dataset(force=True) is True
+
+    (total,), = query("SELECT COUNT(*) FROM stations")
+    assert total == len(station_dataset.load_dataset()[1])
+    assert query("SELECT name_en FROM stations WHERE code = '1570'")[0][0] == "Taichung"
+
+
+def test_snapshot_is_rejected_after_dataset_changes(app_db, monkeypatch):
+    data_dir = use_data_dir(app_db, monkeypatch)
+
+    station_dataset.write_snapshot()
+    snapshot = station_dataset.load_snapshot()
+    assert {"code": "1000", "name": "臺北"}.items() <= snapshot[10].items()
+
+    path = data_dir / "stations.json"
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    doc["version"] += 1
+    doc["stations"].append({"code": "9999", "name": "測試"})
+    path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+
+    assert station_dataset.load_snapshot() is None
+    station_dataset.write_snapshot()
+    assert station_dataset.load_snapshot()[-1]["code"] == "9999"
+
+
+def test_snapshot_survives_line_ending_changes(app_db, monkeypatch):
+    data_dir = use_data_dir(app_db, monkeypatch)
+    station_dataset.write_snapshot()
+
+    # Windows checkout（core.autocrlf）：內容相同、換行改為 CRLF；編輯器另存加上 BOM
+    for name in ("stations.json", "station_names.json"):
+        path = data_dir / name
+        text = path.read_bytes().replace(b"\r\n", b"\n")
+        path.write_bytes(b"\xef\xbb\xbf" + text.replace(b"\n", b"\r\n"))
+
+    assert station_dataset.load_snapshot() is not None
+    assert len(station_dataset.load_dataset()[1]) == len(station_dataset.load_snapshot())
@@ -0,0 +1,74 @@
+import time
+
+from db import database
+from repository.recent_station_repository import RecentStationRepository
+from services.station_frecency import StationFrecency
+from services.station_index import StationIndex
+
+DAY = 86400
+
+
+def test_frequent_station_outranks_older_single_use(app_db):
+    repo = RecentStationRepository()
+    frecency = StationFrecency(repo, half_life_days=7, flush_delay=60)
+
+    now = 1_700_000_000
+    for day in range(3):
+        frecency.record("1570", "臺中", now=now - 30 * DAY + day)
+    frecency.record("1000", "臺北", now=now - 6 * DAY)
+    frecency.record("1930", "臺南", now=now - 5 * DAY)
+
+    assert [st["code"] for st in frecency.top(3, now=now)] == ["1930", "1000", "1570"]
+
+    for _ in range(3):
+        frecency.record("1570", "臺中", now=now)
+    assert frecency.top(1, now=now)[0]["code"] == "1570"
+
+
+def test_close_flushes_pending_changes(app_db):
+    repo = RecentStationRepository()
+    frecency = StationFrecency(repo, flush_delay=60)
+    frecency.record("1000", "臺北")
+    frecency.record("1000", "臺北")
+    assert repo.load_all() == []
+
+    frecency.close()
+
+    rows = repo.load_all()
+    assert [(r["code"], r["use_count"]) for r in rows] == [("1000", 2)]
+    assert StationFrecency(repo).top(1)[0]["code"] == "1000"
+
+
+def wait_for_use_count(repo, expected: int, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        rows = repo.load_all()
+        if rows and rows[0]["use_count"] == expected:
+            return
+        assert time.monotonic() < deadline, rows
+        time.sleep(0.005)
+
+
+def test_background_flushes_reuse_one_connection(app_db):
+    repo = RecentStationRepository()
+    frecency = StationFrecency(repo, flush_delay=0.01)
+    repo.load_all()
+    before = len(database._manager._all)
+
+    for n in range(1, 11):
+        frecency.record("1000", "臺北")
+        wait_for_use_count(repo, n)
+
+    frecency.close()
+    # 只多一條背景 thread 的連線
+    assert len(database._manager._all) <= before + 1
+
+
+def test_boosts_reorder_within_same_level():
+    index = StationIndex([
+        {"code": "1000", "name": "臺北"},
+        {"code": "1570", "name": "臺中"},
+    ])
+    assert [s["code"] for s in index.search("臺")] == ["1000", "1570"]
+    ranked = index.search("臺", boosts={"1570": 3.0})
+    assert [s["code"] for s in ranked] == ["1570", "1000"]
@@ -0,0 +1,69 @@
+from services.station_index import StationIndex
+
+STATIONS = [
+    {"code": "1000", "name": "臺北"},
+    {"code": "1001", "name": "臺北-環島"},
+    {"code": "1010", "name": "萬華"},
+    {"code": "1180", "name": "竹北"},
+    {"code": "1420", "name": "臺中港"},
+    {"code": "1570", "name": "臺中"},
+    {"code": "3300", "name": "中里"},
+]
+
+
+def codes(results):
+    return [st["code"] for st in results]
+
+
+def test_exact_code_ranks_before_code_prefix():
+    index = StationIndex(STATIONS)
+    assert codes(index.search("100")) == ["1000", "1001"]
+    assert codes(index.search("1000"))[0] == "1000"
+
+
+def test_name_prefix_ranks_before_substring():
+    index = StationIndex(STATIONS)
+    assert codes(index.search("臺中")) == ["1570", "1420"]
+    assert codes(index.search("中")) == ["3300", "1570", "1420"]
+    assert codes(index.search("北")) == ["1000", "1180", "1001"]
+
+
+def test_selected_text_and_missing_keyword():
+    index = StationIndex(STATIONS)
+    assert codes(index.search("1570-臺中")) == ["1570"]
+    assert index.search("高雄") == []
+    assert index.search("  ") == []
+
+
+def test_duplicate_codes_are_indexed_once():
+    index = StationIndex(STATIONS + [{"code": "1000", "name": "臺北"}])
+    assert len(index) == len(STATIONS)
+    assert codes(index.search("臺北")) == ["1000", "1001"]
+
+
+def test_variant_and_full_width_input_folds_to_same_key():
+    index = StationIndex(STATIONS)
+    assert codes(index.search("台中")) == ["1570", "1420"]
+    assert codes(index.search("台北")) == ["1000", "1001"]
+    assert codes(index.search("１５７０")) == ["1570"]
+
+
+ROMANIZED = [
+    {"code": "1570", "name": "臺中", "name_en": "Taichung", "name_pinyin": "taizhong"},
+    {"code": "1420", "name": "臺中港", "name_en": "Taichung Port", "name_pinyin": "taizhonggang"},
+    {"code": "2380", "name": "臺東", "name_en": "Taitung", "name_pinyin": "taidong"},
+    {"code": "2770", "name": "蘇澳", "name_en": "Su'ao", "name_pinyin": "su'ao"},
+]
+
+
+def test_english_and_pinyin_names():
+    index = StationIndex(ROMANIZED)
+    assert codes(index.search("Taichung")) == ["1570", "1420"]
+    assert codes(index.search("taizhong")) == ["1570", "1420"]
+    assert codes(index.search("suao")) == ["2770"]
+
+
+def test_misspelled_romanization_falls_back_to_similarity():
+    index = StationIndex(ROMANIZED)
+    assert codes(index.search("taichng"))[0] == "1570"
+    assert index.search("xyzzy") == []
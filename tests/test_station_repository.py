@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+from db import database
+from db.migrations import latest_version, migrate, migrate_all
+from repository.station_repository import StationRepository
+
+
+def test_reads_through_shared_readonly_connection(app_db):
+    with database.transaction(database.STATION_DB_PATH) as conn:
+        conn.execute(
+            "INSERT INTO stations (code, name, search_key) VALUES ('1000', '臺北', '台北')"
+        )
+    database.checkpoint(database.STATION_DB_PATH)
+
+    repo = StationRepository()
+    assert [s["code"] for s in repo.list_all()] == ["1000"]
+    assert repo.conn is StationRepository().conn
+
+    with pytest.raises(sqlite3.OperationalError):
+        repo.conn.execute("DELETE FROM stations")
+
+
+def test_reopen_sees_updated_file(app_db):
+    repo = StationRepository()
+    assert repo.list_all() == []
+
+    with database.transaction(database.STATION_DB_PATH) as conn:
+        conn.execute("INSERT INTO stations (code, name) VALUES ('1570', '臺中')")
+    database.checkpoint(database.STATION_DB_PATH)
+    repo.reopen()
+
+    assert [s["search_key"] for s in repo.list_all()] == ["台中"]
+
+
+def test_reopen_does_not_close_connection_in_use(app_db):
+    old = StationRepository().conn
+    cursor = old.execute("SELECT COUNT(*) FROM stations")
+
+    StationRepository().reopen()
+
+    # 其他 thread 手上的舊連線仍可讀完
+    assert cursor.fetchone()[0] == 0
+    assert StationRepository().conn is not old
+
+
+def test_recent_stations_dropped_after_ticket_copies_them(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "ticket.db")
+    monkeypatch.setattr(database, "EMPLOYEE_DB_PATH", tmp_path / "employees.db")
+    monkeypatch.setattr(database, "STATION_DB_PATH", tmp_path / "stations.db")
+    try:
+        # ticket.db 尚未升級：停在刪除 recent_stations 之前
+        assert migrate("stations") == latest_version("stations") - 1
+        with database.transaction(database.STATION_DB_PATH) as conn:
+            conn.execute(
+                "INSERT INTO recent_stations (code, name, use_count, score, scored_at)"
+                " VALUES ('1000', '臺北', 3, 2.5, 1700000000)"
+            )
+
+        migrate_all()
+
+        stations = database.get_connection(database.STATION_DB_PATH)
+        assert stations.execute("PRAGMA user_version").fetchone()[0] == latest_version("stations")
+        assert stations.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'recent_stations'"
+        ).fetchone() is None
+
+        rows = database.get_connection().execute(
+            "SELECT code, use_count FROM main.recent_stations"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [("1000", 3)]
+    finally:
+        database.close_all_connections()
+
+
+def test_migrating_a_copy_does_not_touch_default_databases(tmp_path, monkeypatch):
+    # 預設的 ticket.db：已是最新版本、非 WAL（檔頭第 18、19 byte 為 1）
+    ticket = tmp_path / "ticket.db"
+    conn = sqlite3.connect(ticket)
+    conn.execute(f"PRAGMA user_version = {latest_version('ticket')}")
+    conn.close()
+    monkeypatch.setattr(database, "DB_PATH", ticket)
+    monkeypatch.setattr(database, "STATION_DB_PATH", tmp_path / "stations.db")
+
+    copy_dir = tmp_path / "copy"
+    copy_dir.mkdir()
+    try:
+        # 複本旁沒有 ticket.db：停在刪除 recent_stations 之前
+        assert migrate("stations", copy_dir / "stations.db") == latest_version("stations") - 1
+    finally:
+        database.close_all_connections()
+    assert ticket.read_bytes()[18:20] == b"\x01\x01"
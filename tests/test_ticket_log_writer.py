@@ -0,0 +1,127 @@
+import threading
+import time
+
+from db.database import get_connection
+from repository.ticket_log_repo import TicketLogRepository, TicketLogWriter
+
+
+def record(train_no: str, status: str = "SUCCESS") -> dict:
+    return {
+        "employee_id": "E001",
+        "travel_date": "2026/11/02",
+        "start_station": "1000",
+        "end_station": "3300",
+        "train_no": train_no,
+        "ticket_qty": 1,
+        "status": status,
+    }
+
+
+def written_train_nos() -> list[str]:
+    rows = get_connection().execute(
+        "SELECT train_no FROM ticket_order_log ORDER BY train_no"
+    ).fetchall()
+    return [r["train_no"] for r in rows]
+
+
+def spy_insert_many(monkeypatch, fail_on: str | None = None):
+    """
+    記錄每次 insert_many 的 (thread, 車次)；fail_on 車次出現時丟例外
+    回傳的 gate 未 set 前，背景 thread 的寫入會停住（用來讓佇列累積）
+    """
+    real = TicketLogRepository.insert_many
+    gate = threading.Event()
+    calls = []
+
+    def insert_many(records):
+        records = list(records)
+        if threading.current_thread().name == "TicketLogWriter":
+            gate.wait(2)
+        calls.append((
+            threading.current_thread().name,
+            [r["train_no"] for r in records],
+        ))
+        if fail_on in {r["train_no"] for r in records}:
+            raise ValueError("bad row")
+        real(records)
+
+    monkeypatch.setattr(TicketLogRepository, "insert_many", staticmethod(insert_many))
+    return calls, gate
+
+
+def start_blocked_writer(monkeypatch, first: str, **kwargs):
+    """
+    啟動寫入器，並讓背景 thread 取走第一批後停在 gate
+    """
+    calls, gate = spy_insert_many(monkeypatch, kwargs.pop("fail_on", None))
+    writer = TicketLogWriter(**kwargs)
+    writer.start()
+    writer.write([record(first)])
+    while not writer._queue.empty():
+        time.sleep(0.001)
+    return writer, calls, gate
+
+
+def test_queued_batches_are_merged_into_one_transaction(app_db, monkeypatch):
+    writer, calls, gate = start_blocked_writer(monkeypatch, "100")
+
+    writer.write([record("101"), record("102")])
+    writer.write([record("103")])
+    gate.set()
+    writer.close()
+
+    assert calls == [
+        ("TicketLogWriter", ["100"]),
+        ("TicketLogWriter", ["101", "102", "103"]),
+    ]
+    assert written_train_nos() == ["100", "101", "102", "103"]
+
+
+def test_full_queue_falls_back_to_synchronous_write(app_db, monkeypatch):
+    writer, calls, gate = start_blocked_writer(
+        monkeypatch, "101", max_pending=1, put_timeout=0.01
+    )
+
+    writer.write([record("102")])          # 佔滿佇列
+    writer.write([record("103")])          # 佇列已滿：同步寫入
+    assert calls == [("MainThread", ["103"])]
+
+    gate.set()
+    writer.close()
+    assert written_train_nos() == ["101", "102", "103"]
+
+
+def test_close_drains_pending_batches(app_db, monkeypatch):
+    writer, calls, gate = start_blocked_writer(monkeypatch, "000")
+    for n in range(1, 20):
+        writer.write([record(f"{n:03d}")])
+    gate.set()
+    writer.close()
+
+    assert len(written_train_nos()) == 20
+    # 關閉後改為同步寫入
+    writer.write([record("999")])
+    assert "999" in written_train_nos()
+
+
+def test_failed_batch_is_retried_per_submission(app_db, monkeypatch):
+    writer, calls, gate = start_blocked_writer(
+        monkeypatch, "100", fail_on="BAD", retries=1, retry_delay=0
+    )
+
+    writer.write([record("101")])
+    writer.write([record("BAD"), record("102")])
+    writer.write([record("103")])
+    gate.set()
+    writer.close()
+
+    # 合併失敗 → 各自重寫；壞的那次送出重試後放棄，不影響其他
+    assert [nos for _, nos in calls] == [
+        ["100"],
+        ["101", "BAD", "102", "103"],
+        ["101"],
+        ["BAD", "102"],
+        ["BAD", "102"],
+        ["103"],
+    ]
+    assert written_train_nos() == ["100", "101", "103"]
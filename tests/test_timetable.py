@@ -0,0 +1,76 @@
+import json
+
+from db.database import get_connection
+from repository.timetable_repo import TimetableRepository
+from services import timetable_import
+
+
+def stop(seq, code, time):
+    return {
+        "StopSequence": seq,
+        "StationID": code,
+        "ArrivalTime": time,
+        "DepartureTime": time,
+    }
+
+
+# TDX v3 DailyTrainTimetable（節錄）
+TDX_DOC = {
+    "TrainDate": "2026-11-02",
+    "TrainTimetables": [
+        {
+            "TrainInfo": {"TrainNo": "123"},
+            "StopTimes": [
+                stop(1, "1000", "08:00"),
+                stop(2, "1080", "08:40"),
+                stop(3, "3300", "10:10"),
+            ],
+        },
+        {
+            "TrainInfo": {"TrainNo": "124"},
+            "StopTimes": [stop(1, "3300", "12:00"), stop(2, "1000", "14:10")],
+        },
+    ],
+}
+
+
+def test_import_tdx_file_and_replace_date(app_db):
+    path = app_db / "timetable.json"
+    path.write_text(json.dumps(TDX_DOC), encoding="utf-8")
+
+    assert timetable_import.import_file(path) == {"2026-11-02": 2}
+    assert timetable_import.import_file(path) == {"2026-11-02": 2}
+
+    (total,), = get_connection().execute(
+        "SELECT COUNT(*) FROM timetable_stop"
+    ).fetchall()
+    assert total == 5
+
+
+def test_parse_ptx_list_with_date_override():
+    doc = [{
+        "DailyTrainInfo": {"TrainNo": "0151"},
+        "StopTimes": [stop(2, "1080", "09:00"), stop(1, "1000", "08:30")],
+    }]
+    parsed = timetable_import.parse_timetable(doc, train_date="2026/11/03")
+    assert parsed == {
+        "2026-11-03": {
+            "0151": [(1, "1000", "08:30", "08:30"), (2, "1080", "09:00", "09:00")],
+        },
+    }
+
+
+def test_validate_trains(app_db):
+    for date, trains in timetable_import.parse_timetable(TDX_DOC).items():
+        TimetableRepository.replace_date(date, trains.items())
+
+    def validate(train_nos, date="2026-11-02", origin="1000", dest="3300"):
+        return TimetableRepository.validate_trains(date, origin, dest, train_nos)
+
+    assert validate(["123", "0123"]) == []
+    assert validate(["123"], date="2026/11/02") == []
+    assert validate(["999"]) == ["車次 999 於 2026-11-02 不存在"]
+    assert validate(["123"], dest="1210") == ["車次 123 不停靠迄站 1210"]
+    assert validate(["124"]) == ["車次 124 行駛方向不是 1000 → 3300"]
+    # 尚未匯入時刻表的日期不檢查
+    assert validate(["999"], date="2026-11-04") == []
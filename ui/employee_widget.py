@@ -3,15 +3,17 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QPushButton,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMessageBox,
+    QFileDialog,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 from ui.employee_add_dialog import EmployeeAddDialog
 from ui.employee_edit_dialog import EmployeeEditDialog
+from ui.models.employee_list_model import EmployeeListModel
 from app_context.employee_selection import EmployeeSelectionContext
 
 
@@ -21,8 +23,12 @@ class EmployeeWidget(QWidget):
     - 顯示員工清單
     - 提供 CRUD 操作入口
     - 與訂票系統同步選擇員工
+    - 搜尋欄：輸入停頓後才查詢（全文索引）
     """
 
+    SEARCH_DELAY_MS = 200
+    SEARCH_LIMIT = 200
+
     def __init__(
         self,
         employee_controller=None,
@@ -59,10 +65,29 @@ class EmployeeWidget(QWidget):
         """)
         layout.addWidget(title)
 
+        # ===== 搜尋 =====
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜尋員工編號 / 姓名 / 部門")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.refresh)
+
         # ===== 員工清單 =====
-        self.employee_list = QListWidget()
+        self.employee_model = EmployeeListModel()
+        self.employee_list = QListView()
+        self.employee_list.setModel(self.employee_model)
+        self.employee_list.setUniformItemSizes(True)
         layout.addWidget(self.employee_list, stretch=1)
 
+        self.empty_label = QLabel()
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.hide()
+        layout.addWidget(self.empty_label)
+
         # ===== 操作按鈕 =====
         button_layout = QHBoxLayout()
 
@@ -70,24 +95,31 @@ class EmployeeWidget(QWidget):
         self.add_button = QPushButton("新增")
         self.edit_button = QPushButton("編輯")
         self.toggle_active_button = QPushButton("停用")
+        self.import_button = QPushButton("匯入")
+        self.export_button = QPushButton("匯出")
 
         button_layout.addWidget(self.refresh_button)
         button_layout.addWidget(self.add_button)
         button_layout.addWidget(self.edit_button)
         button_layout.addWidget(self.toggle_active_button)
         button_layout.addStretch()
+        button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.export_button)
 
         layout.addLayout(button_layout)
 
         # ===== Signals =====
-        self.refresh_button.clicked.connect(self.refresh)
+        self.search_input.textChanged.connect(self._search_timer.start)
+        self.refresh_button.clicked.connect(self._on_reload)
         self.add_button.clicked.connect(self._on_add_employee)
         self.edit_button.clicked.connect(self._on_edit_employee)
         self.toggle_active_button.clicked.connect(self._on_toggle_active)
-        self.employee_list.currentItemChanged.connect(
+        self.import_button.clicked.connect(self._on_import)
+        self.export_button.clicked.connect(self._on_export)
+        self.employee_list.selectionModel().currentChanged.connect(
             self._on_selection_changed
         )
-        self.employee_list.itemDoubleClicked.connect(
+        self.employee_list.doubleClicked.connect(
             self._on_item_double_clicked
         )
 
@@ -96,38 +128,73 @@ class EmployeeWidget(QWidget):
     # Public API
     # =========================
     def refresh(self):
-        self.employee_list.clear()
-
+        """
+        重新查詢清單；內容相同的 row 不會重繪
+        """
         if not self.controller:
-            self.employee_list.addItem("（尚未接上 Controller）")
+            self.employee_model.set_employees([])
+            self._show_empty("（尚未接上 Controller）")
             return
 
-        employees = self.controller.list_all()
+        keyword = self.search_input.text().strip()
+        if keyword:
+            employees = self.controller.search(keyword, limit=self.SEARCH_LIMIT)
+        else:
+            employees = self.controller.list_all()
+
+        current = self._get_selected_employee()
+        self.employee_model.set_employees(employees)
+
         if not employees:
-            self.employee_list.addItem("（目前沒有員工資料）")
+            self._show_empty(
+                "（找不到符合的員工）" if keyword else "（目前沒有員工資料）"
+            )
+            self.toggle_active_button.setEnabled(False)
             return
 
-        for emp in employees:
-            status = "在職" if emp.is_active else "停用"
-            text = f"{emp.emp_id} | {emp.name} | {emp.department} | {status}"
-
-            item = QListWidgetItem(text)
-            item.setData(Qt.UserRole, emp)
-            self.employee_list.addItem(item)
+        self.empty_label.hide()
 
-        self.toggle_active_button.setEnabled(False)
+        # 保留原本的選取；不在清單中才選第一筆
+        index = (
+            self.employee_model.index_of(current.emp_id)
+            if current else None
+        )
+        if not index or not index.isValid():
+            index = self.employee_model.index(0)
+        self.employee_list.setCurrentIndex(index)
 
-        if self.employee_list.count() > 0:
-            self.employee_list.setCurrentRow(0)
+    def _on_reload(self):
+        if self.controller:
+            self.controller.reload()
+        self.refresh()
 
     # =========================
     # Helpers
     # =========================
     def _get_selected_employee(self):
-        item = self.employee_list.currentItem()
-        if not item:
-            return None
-        return item.data(Qt.UserRole)
+        return self.employee_model.employee_at(
+            self.employee_list.currentIndex().row()
+        )
+
+    def _show_empty(self, text: str):
+        self.empty_label.setText(text)
+        self.empty_label.show()
+
+    def _apply_change(self, employee):
+        """
+        CRUD 完成後只更新該員工的 row；搜尋中則重新查詢（排序依相關度）
+        """
+        if self.search_input.text().strip():
+            self.refresh()
+            return
+
+        self.employee_model.upsert(employee)
+        self.empty_label.hide()
+        self.employee_list.setCurrentIndex(
+            self.employee_model.index_of(employee.emp_id)
+        )
+        # 同一 row 內容改變不會觸發 currentChanged，按鈕狀態要自己更新
+        self._on_selection_changed()
 
     # =========================
     # Selection Sync
@@ -147,8 +214,8 @@ class EmployeeWidget(QWidget):
         if self.employee_selection:
             self.employee_selection.set(emp)
 
-    def _on_item_double_clicked(self, item):
-        emp = item.data(Qt.UserRole)
+    def _on_item_double_clicked(self, index):
+        emp = self.employee_model.employee_at(index.row())
         if not emp:
             return
 
@@ -165,12 +232,9 @@ class EmployeeWidget(QWidget):
         if not employee:
             return
 
-        for i in range(self.employee_list.count()):
-            item = self.employee_list.item(i)
-            emp = item.data(Qt.UserRole)
-            if emp and emp.emp_id == employee.emp_id:
-                self.employee_list.setCurrentRow(i)
-                break
+        index = self.employee_model.index_of(employee.emp_id)
+        if index.isValid() and index != self.employee_list.currentIndex():
+            self.employee_list.setCurrentIndex(index)
 
     # =========================
     # CRUD
@@ -182,14 +246,14 @@ class EmployeeWidget(QWidget):
 
         data = dialog.get_data()
         try:
-            self.controller.create(
+            emp = self.controller.create(
                 emp_id=data["emp_id"],
                 name=data["name"],
                 id_number=data["id_number"],
                 department=data["department"],
             )
             QMessageBox.information(self, "成功", "員工已新增")
-            self.refresh()
+            self._apply_change(emp)
         except Exception as e:
             QMessageBox.critical(self, "錯誤", str(e))
 
@@ -205,14 +269,14 @@ class EmployeeWidget(QWidget):
                 return
 
             data = dialog.get_data()
-            self.controller.update_info(
+            updated = self.controller.update_info(
                 emp_id=emp.emp_id,
                 name=data["name"],
                 id_number=data["id_number"],
                 department=data["department"],
             )
             QMessageBox.information(self, "成功", "員工資料已更新")
-            self.refresh()
+            self._apply_change(updated)
 
         except Exception as e:
             QMessageBox.critical(self, "錯誤", str(e))
@@ -224,16 +288,61 @@ class EmployeeWidget(QWidget):
 
         try:
             if emp.is_active:
-                self.controller.deactivate(emp.emp_id)
+                updated = self.controller.deactivate(emp.emp_id)
                 QMessageBox.information(self, "完成", "員工已停用")
             else:
-                self.controller.activate(emp.emp_id)
+                updated = self.controller.activate(emp.emp_id)
                 QMessageBox.information(self, "完成", "員工已啟用")
-            self.refresh()
+            self._apply_change(updated)
         except Exception as e:
             QMessageBox.critical(self, "錯誤", str(e))
 
 
+    # =========================
+    # Import / Export
+    # =========================
+    FILE_FILTER = "CSV (*.csv);;JSON Lines (*.jsonl *.ndjson)"
+
+    def _on_import(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "匯入員工", "", self.FILE_FILTER
+        )
+        if not path:
+            return
+
+        try:
+            result = self.controller.import_file(path)
+        except Exception as e:
+            QMessageBox.critical(self, "錯誤", str(e))
+            return
+
+        self.refresh()
+
+        message = f"成功匯入 {result.imported} 筆"
+        if result.failed:
+            lines = "\n".join(
+                f"第 {line_no} 行：{reason}"
+                for line_no, reason in result.errors[:20]
+            )
+            more = "\n…" if result.failed > 20 else ""
+            message += f"，失敗 {result.failed} 筆：\n{lines}{more}"
+            QMessageBox.warning(self, "匯入完成", message)
+        else:
+            QMessageBox.information(self, "匯入完成", message)
+
+    def _on_export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "匯出員工", "employees.csv", self.FILE_FILTER
+        )
+        if not path:
+            return
+
+        try:
+            count = self.controller.export_file(path)
+            QMessageBox.information(self, "完成", f"已匯出 {count} 筆")
+        except Exception as e:
+            QMessageBox.critical(self, "錯誤", str(e))
+
     def _emit_confirm_selection(self):
         """
         Hook method: 由外部（MainWindow）決定要做什麼
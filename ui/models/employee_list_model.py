@@ -0,0 +1,200 @@
+from bisect import bisect_left
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from domain.employee import Employee
+
+
+class EmployeeListModel(QAbstractListModel):
+    """
+    員工清單 Model
+    - 依 emp_id 維護 row 索引（emp_id → row），選取同步 O(1)
+    - set_employees / upsert / remove 只通知新增、移除、內容改變的 row，
+      不重建整個清單（選取與捲動位置得以保留）
+    - _keys：與 _rows 對齊的 emp_id；未搜尋時清單依 emp_id 排序，upsert 直接 bisect
+    """
+
+    EmployeeRole = Qt.UserRole
+
+    def __init__(self, employees: list[Employee] | None = None):
+        super().__init__()
+        self._rows: list[Employee] = list(employees or [])
+        self._keys: list[str] = [e.emp_id for e in self._rows]
+        self._index: dict[str, int] = {}
+        self._reindex()
+
+    # =========================
+    # Basic
+    # =========================
+    def rowCount(self, parent=QModelIndex()):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        emp = self._rows[index.row()]
+
+        if role == Qt.DisplayRole:
+            status = "在職" if emp.is_active else "停用"
+            return f"{emp.emp_id} | {emp.name} | {emp.department} | {status}"
+
+        if role == self.EmployeeRole:
+            return emp
+
+        return None
+
+    # =========================
+    # Lookup
+    # =========================
+    def employee_at(self, row: int) -> Employee | None:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def row_of(self, emp_id: str) -> int | None:
+        return self._index.get(emp_id)
+
+    def index_of(self, emp_id: str) -> QModelIndex:
+        row = self._index.get(emp_id)
+        return self.index(row) if row is not None else QModelIndex()
+
+    # =========================
+    # Diffs
+    # =========================
+    def set_employees(self, employees: list[Employee]):
+        """
+        換成新的清單
+        - 不在新清單的 row：依連續區段移除
+        - 新出現的員工：依連續區段插入
+        - 留下的 row 只在內容改變時通知
+        - 順序改變（例：搜尋依相關度重排）：保留最長的同序 row，
+          其餘當作移除後再插入
+        """
+        employees = list(employees)
+        new_ids = [e.emp_id for e in employees]
+        position = {key: row for row, key in enumerate(new_ids)}
+
+        if len(position) != len(new_ids):
+            # 重複的 emp_id 無法對應 row，整批重設
+            self.beginResetModel()
+            self._rows = employees
+            self._keys = new_ids
+            self._reindex()
+            self.endResetModel()
+            return
+
+        stay = _in_order(
+            [(row, position[key]) for row, key in enumerate(self._keys)
+             if key in position]
+        )
+
+        # 1. 移除：由後往前，前面 row 的位置不受影響
+        removed = [row for row in range(len(self._keys)) if row not in stay]
+        for first, last in reversed(_ranges(removed)):
+            self._remove_rows(first, last)
+        if removed:
+            self._reindex(removed[0])
+
+        # 2. 插入 / 更新：處理到 row 時，_rows[:row] 已與新清單相同
+        row = 0
+        while row < len(employees):
+            if new_ids[row] in self._index:
+                if employees[row] != self._rows[row]:
+                    self._rows[row] = employees[row]
+                    idx = self.index(row)
+                    self.dataChanged.emit(idx, idx)
+                row += 1
+                continue
+
+            end = row
+            while end < len(employees) and new_ids[end] not in self._index:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._rows[row:row] = employees[row:end]
+            self._keys[row:row] = new_ids[row:end]
+            self._reindex(row)
+            self.endInsertRows()
+            row = end
+
+    def upsert(self, employee: Employee):
+        """
+        已存在：更新該 row；不存在：依 emp_id 排序位置插入
+        """
+        row = self._index.get(employee.emp_id)
+        if row is not None:
+            self._rows[row] = employee
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+            return
+
+        row = bisect_left(self._keys, employee.emp_id)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, employee)
+        self._keys.insert(row, employee.emp_id)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def remove(self, emp_id: str):
+        row = self._index.get(emp_id)
+        if row is None:
+            return
+        self._remove_rows(row, row)
+        self._reindex(row)
+
+    def _remove_rows(self, first: int, last: int):
+        # 呼叫端負責之後的 _reindex
+        self.beginRemoveRows(QModelIndex(), first, last)
+        for key in self._keys[first:last + 1]:
+            del self._index[key]
+        del self._rows[first:last + 1]
+        del self._keys[first:last + 1]
+        self.endRemoveRows()
+
+    def _reindex(self, start: int = 0):
+        if start == 0:
+            self._index = {}
+        for row in range(start, len(self._keys)):
+            self._index[self._keys[row]] = row
+
+
+def _in_order(pairs: list[tuple[int, int]]) -> set[int]:
+    """
+    [(舊 row, 新 row)]（依舊 row 遞增）→ 新 row 也遞增的最長子序列的舊 row
+    O(n log n)
+    """
+    tails: list[int] = []       # tails[k]：長度 k+1 的子序列結尾新 row 最小值
+    tail_at: list[int] = []     # 對應的 pairs 位置
+    prev: list[int] = [-1] * len(pairs)
+
+    for i, (_, new_row) in enumerate(pairs):
+        k = bisect_left(tails, new_row)
+        if k == len(tails):
+            tails.append(new_row)
+            tail_at.append(i)
+        else:
+            tails[k] = new_row
+            tail_at[k] = i
+        prev[i] = tail_at[k - 1] if k else -1
+
+    keep = set()
+    i = tail_at[-1] if tail_at else -1
+    while i >= 0:
+        keep.add(pairs[i][0])
+        i = prev[i]
+    return keep
+
+
+def _ranges(rows: list[int]) -> list[tuple[int, int]]:
+    """
+    遞增的 row 編號 → 連續區段 [(first, last)]
+    """
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
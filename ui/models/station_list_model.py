@@ -0,0 +1,45 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class StationListModel(QAbstractListModel):
+    """
+    自動完成候選站 Model
+    - 每筆為 {"code", "name"}，可帶 "hint"（例：最近、常用）顯示在站名後
+    """
+
+    StationRole = Qt.UserRole
+
+    def __init__(self):
+        super().__init__()
+        self._stations: list[dict] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._stations)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        st = self._stations[index.row()]
+
+        if role == Qt.DisplayRole:
+            text = f"{st['code']}-{st['name']}"
+            hint = st.get("hint")
+            return f"{text}（{hint}）" if hint else text
+
+        if role == self.StationRole:
+            return st
+
+        return None
+
+    def station_at(self, row: int) -> dict | None:
+        if 0 <= row < len(self._stations):
+            return self._stations[row]
+        return None
+
+    def set_stations(self, stations: list[dict]):
+        self.beginResetModel()
+        self._stations = list(stations)
+        self.endResetModel()
@@ -1,4 +1,4 @@
-from PySide6.QtCore import QAbstractTableModel, Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
 from datetime import datetime
 
 class TicketRequestTableModel(QAbstractTableModel):
@@ -14,19 +14,61 @@ class TicketRequestTableModel(QAbstractTableModel):
         "申請時間",
     ]
 
-    def __init__(self, rows: list):
+    def __init__(
+        self,
+        rows: list | None = None,
+        fetch_page=None,
+        page_cursor=None,
+        page_size: int = 100,
+    ):
+        """
+        - rows：固定資料
+        - fetch_page(limit, before)：分頁來源，捲動到底時由 view 呼叫 fetchMore
+        - page_cursor(row)：由最後一筆資料取得下一頁的 cursor
+        """
         super().__init__()
-        self._rows = rows 
+        self._rows = list(rows or [])
+        self._fetch_page = fetch_page
+        self._page_cursor = page_cursor
+        self._page_size = page_size
+        self._has_more = fetch_page is not None
 
     # =========================
     # Basic
     # =========================
-    def rowCount(self, parent=None):
+    def rowCount(self, parent=QModelIndex()):
+        if parent is not None and parent.isValid():
+            return 0
         return len(self._rows)
 
     def columnCount(self, parent=None):
         return len(self.HEADERS)
 
+    # =========================
+    # Lazy loading
+    # =========================
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+
+        before = self._page_cursor(self._rows[-1]) if self._rows else None
+        rows = self._fetch_page(self._page_size, before)
+
+        if len(rows) < self._page_size:
+            self._has_more = False
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
     # =========================
     # Data
     # =========================
@@ -2,25 +2,67 @@ from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from ui.models.station_list_model import StationListModel
+
+
+class _LookupSignals(QObject):
+    # (查詢序號, 結果)
+    finished = Signal(int, list)
+
+
+class _LookupTask(QRunnable):
+    """
+    在 thread pool 執行的查詢；結果以 signal 送回 UI thread
+    """
+
+    def __init__(self, seq: int, lookup, signals: _LookupSignals):
+        super().__init__()
+        self.seq = seq
+        self.lookup = lookup
+        self.signals = signals
+
+    def run(self):
+        try:
+            results = self.lookup()
+        except Exception as e:
+            print(f"[StationAutoComplete] 查詢失敗: {e}")
+            results = []
+
+        try:
+            self.signals.finished.emit(self.seq, results)
+        except RuntimeError:
+            # 元件已關閉（signals 已隨 widget 刪除）
+            pass
 
 
 class StationAutoComplete(QWidget):
     """
     起 / 迄站自動完成元件
-    - SQLite 搜尋
-    - 最近使用站點
+    - 記憶體索引搜尋（輸入停頓後才查詢，於背景 thread 執行）
+    - 較舊的查詢結果晚到時直接丟棄
+    - 空白時：建議站（例：依起站預測的常用迄站）→ 最近使用站點（依使用熱度）
     - 輸出格式：code-name（例：1000-台北）
     """
 
     stationSelected = Signal(dict)
 
+    DEBOUNCE_MS = 120
+
     def __init__(self, controller, placeholder="", parent=None):
         super().__init__(parent)
         self.controller = controller
+
+        # 每次輸入遞增；只接受最新序號的結果
+        self._seq = 0
+        self._suggestions: list[dict] = []
+        self._pool = QThreadPool.globalInstance()
+        self._signals = _LookupSignals(self)
+        self._signals.finished.connect(self._on_lookup_finished)
+
         self._init_ui(placeholder)
 
     # =========================
@@ -33,66 +75,94 @@ class StationAutoComplete(QWidget):
         self.input = QLineEdit()
         self.input.setPlaceholderText(placeholder)
 
-        self.list = QListWidget()
+        self.model = StationListModel()
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setUniformItemSizes(True)
         self.list.hide()
         self.list.setMaximumHeight(200)
 
         layout.addWidget(self.input)
         layout.addWidget(self.list)
 
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._start_lookup)
+
         self.input.textChanged.connect(self._on_text_changed)
-        self.list.itemClicked.connect(self._on_item_clicked)
+        self.list.clicked.connect(self._on_item_clicked)
 
     # =========================
     # Autocomplete logic
     # =========================
     def _on_text_changed(self, text: str):
-        self.list.clear()
-
-        # ===== 空白 → 最近使用 =====
-        if not text.strip():
-            recents = self.controller.get_recent()
-            for st in recents:
-                item = QListWidgetItem(
-                    f"{st['code']}-{st['name']}（最近）"
-                )
-                item.setData(Qt.UserRole, st)
-                self.list.addItem(item)
-
-            self.list.setVisible(bool(recents))
-            return
-
-        # ===== 搜尋 =====
-        results = self.controller.search(text)
-        if not results:
-            self.list.hide()
+        # 讓進行中的查詢失效，等輸入停頓再查
+        self._seq += 1
+        self._debounce.start()
+
+    def _start_lookup(self):
+        text = self.input.text().strip()
+        seq = self._seq
+
+        # ===== 空白 → 建議站 + 最近使用 =====
+        if not text:
+            suggestions = list(self._suggestions)
+            task = _LookupTask(
+                seq, lambda: self._suggested_and_recent(suggestions), self._signals
+            )
+        else:
+            task = _LookupTask(
+                seq, lambda: self.controller.search(text), self._signals
+            )
+        self._pool.start(task)
+
+    def _suggested_and_recent(self, suggestions: list[dict]) -> list[dict]:
+        results = [{**st, "hint": "常用"} for st in suggestions]
+        seen = {st["code"] for st in suggestions}
+        for st in self.controller.get_recent():
+            if st["code"] not in seen:
+                results.append({**st, "hint": "最近"})
+        return results
+
+    def _on_lookup_finished(self, seq: int, results: list):
+        if seq != self._seq:
             return
 
-        for st in results:
-            item = QListWidgetItem(f"{st['code']}-{st['name']}")
-            item.setData(Qt.UserRole, st)
-            self.list.addItem(item)
-
-        self.list.show()
+        self.model.set_stations(results)
+        self.list.setVisible(bool(results))
 
-    def _on_item_clicked(self, item: QListWidgetItem):
-        station = item.data(Qt.UserRole)
+    def _on_item_clicked(self, index):
+        station = self.model.station_at(index.row())
         if not station:
             return
 
-        # 填入輸入框
+        # 填入輸入框（不觸發新的查詢），並讓尚未回來的查詢失效
+        self._seq += 1
+        self._debounce.stop()
+        self.input.blockSignals(True)
         self.input.setText(f"{station['code']}-{station['name']}")
+        self.input.blockSignals(False)
         self.list.hide()
 
         # 通知外部（TicketPanel）
         self.stationSelected.emit(station)
 
-        # ⭐ 記錄最近使用
-        # self.controller.record_recent(station)
+        # ⭐ 記錄最近使用（記憶體更新，稍後批次寫回）
+        self.controller.record_recent(station)
 
     # =========================
     # Public API
     # =========================
+    def set_suggestions(self, stations: list[dict]):
+        """
+        輸入框空白時優先列出的站（例：依起站預測的迄站）
+        """
+        self._suggestions = list(stations)
+        if not self.input.text().strip():
+            self._seq += 1
+            self._debounce.start()
+
     def get_station_code(self):
         """
         回傳目前選取的站碼（只取 code）
@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import QDate, QTime
 from ui.station_autocomplete import StationAutoComplete
+from core.exceptions import DuplicateRequestError
 from datetime import datetime
 
 
@@ -68,6 +69,9 @@ class TicketPanel(QWidget):
         layout.addWidget(self.from_station)
         layout.addWidget(self.to_station)
 
+        # 選定起站 → 迄站先列出此起站的常用迄站
+        self.from_station.stationSelected.connect(self._on_origin_selected)
+
         # ===== 行程類型 =====
         trip_box = QGroupBox("行程類型")
         trip_layout = QHBoxLayout(trip_box)
@@ -143,6 +147,14 @@ class TicketPanel(QWidget):
         self.submit_btn.clicked.connect(self._on_submit)
         layout.addWidget(self.submit_btn)
 
+    # =========================
+    # Station Sync
+    # =========================
+    def _on_origin_selected(self, station: dict):
+        self.to_station.set_suggestions(
+            self.station_controller.suggest_destinations(station["code"])
+        )
+
     # =========================
     # Employee Sync
     # =========================
@@ -202,17 +214,31 @@ class TicketPanel(QWidget):
         else:
             schedule_at = None
 
+        request = dict(
+            employee=employee,
+            from_station=from_code,
+            to_station=to_code,
+            date=date_str,
+            train_nos=train_nos,
+            ticket_count=ticket_count,
+            one_way=one_way,
+            schedule_at=schedule_at,
+        )
+
         try:
-            self.ticket_controller.submit_ticket(
-                employee=employee,
-                from_station=from_code,
-                to_station=to_code,
-                date=date_str,
-                train_nos=train_nos,
-                ticket_count=ticket_count,
-                one_way=one_way,
-                schedule_at=schedule_at,
-            )
+            try:
+                self.ticket_controller.submit_ticket(**request)
+            except DuplicateRequestError as e:
+                answer = QMessageBox.question(
+                    self,
+                    "重複的訂票請求",
+                    f"{e}\n\n仍要再次送出嗎？",
+                )
+                if answer != QMessageBox.Yes:
+                    return
+                self.ticket_controller.submit_ticket(
+                    **request, allow_duplicate=True
+                )
 
             QMessageBox.information(self, "完成", "訂票流程已啟動")
 
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import (
     QPushButton,
 )
 from repository.ticket_request_repo import TicketRequestRepository
+from repository.ticket_stats_repo import TicketStatsRepository
 from ui.models.ticket_request_table_model import TicketRequestTableModel
 
 
@@ -29,19 +30,30 @@ class TicketRequestLogPanel(QWidget):
         self.table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.table)
 
+        self.stats_label = QLabel()
+        layout.addWidget(self.stats_label)
+
         self.refresh_btn = QPushButton("重新整理")
         self.refresh_btn.clicked.connect(self.refresh)
         layout.addWidget(self.refresh_btn)
 
     def refresh(self):
         """
-        讀取最近 100 筆訂票請求紀錄，並顯示員工姓名、身分證、
-        起迄站（含代碼和文字）、張數、乘車日期、排程、申請時間
+        顯示訂票請求紀錄（員工姓名、身分證、起迄站、張數、乘車日期、
+        排程、申請時間）；先載入最新一頁，往下捲動時再分頁讀取
         """
-        # 確保資料表存在
-        TicketRequestRepository.ensure_table()
-        rows = TicketRequestRepository.fetch_all()
+        model = TicketRequestTableModel(
+            fetch_page=TicketRequestRepository.fetch_page,
+            page_cursor=TicketRequestRepository.page_cursor,
+        )
+        model.fetchMore()
 
-        model = TicketRequestTableModel(rows)
         self.table.setModel(model)
         self.table.resizeColumnsToContents()
+
+        # 今日統計：讀每日統計表，與紀錄筆數無關
+        totals = TicketStatsRepository.totals()
+        self.stats_label.setText(
+            f"今日：請求 {totals['requests']} 筆 / "
+            f"成功 {totals['successes']} / 失敗 {totals['failures']}"
+        )